@@ -17,11 +17,31 @@ settings = Dynaconf(
     root_path=CONFIG_ROOT,
     settings_files=["settings.toml", ".secrets.toml"],
     validators=[
+        Validator("api.token", default=""),
         Validator("data.dir", default=PROJECT_ROOT / "data", cast=Path),
-        Validator("logging.level", default="DEBUG"),
+        Validator("data.download_on_start", default=True, cast=bool),
+        Validator("labeling.strategy", default="fair_hybrid"),
+        Validator("logging.level", default="INFO"),
         Validator("logging.stream", default=True),
+        Validator("logging.queue", default=True),
         Validator("logging.size_kb", default=500),
         Validator("logging.file", default=False),
         Validator("logging.path", default="fairlabel.log", cast=Path),
+        Validator("mitigation.enabled", default=False, cast=bool),
+        Validator("mitigation.eps", default=0.01, cast=float),
+        Validator("partitions.enabled", default=False, cast=bool),
+        Validator("partitions.chunk_rows", default=500_000),
+        Validator("profiling.enabled", default=False, cast=bool),
+        Validator("profiling.keep", default=20),
+        Validator("profiling.dir", default=lambda settings, _: Path(settings.data.dir) / "profiling", cast=Path),
+        Validator("profiling.admin_token", default=""),
+        Validator("proxy.enabled", default=False, cast=bool),
+        Validator("proxy.model", default="linear"),
+        Validator("proxy.full_every", default=20),
+        Validator("proxy.sample", default=5000),
+        Validator("sessions.dir", default=lambda settings, _: Path(settings.data.dir) / "sessions", cast=Path),
+        Validator("sessions.ttl_s", default=1800, cast=float),
+        Validator("sessions.sweep_s", default=60, cast=float),
+        Validator("sessions.max_memory_mb", default=2048),
     ],
 )
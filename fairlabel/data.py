@@ -1,39 +1,87 @@
+import json
 import os
-import re
+import threading
+from collections.abc import Iterable
+from dataclasses import dataclass
+from pathlib import Path
 
-import kagglehub
 import numpy as np
 import pandas as pd
 
 from fairlabel.config import settings
+from fairlabel.log import logger
+from fairlabel.profiling import profiled
 
 os.environ["KAGGLEHUB_CACHE"] = str(settings.data.dir)
 
+MANIFEST = "manifest.json"  # written last by `PartitionedDataset.ingest`, marks complete partitions
+
+_artifact_locks: dict[Path, threading.Lock] = {}
+_artifact_locks_guard = threading.Lock()
+
 
 def cache_data(data_set_name: str) -> str:
+    import kagglehub  # slow to import, only needed to fill the cache
+
     path = kagglehub.dataset_download(data_set_name)
-    print("Path to dataset files:", path)
+    logger.info(f"Path to dataset files: {path}")
     return path
 
 
-def get_dataset(short_name: str) -> pd.DataFrame:
+def get_dataset_file(short_name: str) -> Path:
     folder = settings.data.dir / "datasets" / settings.dataset[short_name].name / "versions"
-    file = list(folder.glob("*/*.csv"))[-1]
+    return list(folder.glob("*/*.csv"))[-1]
+
+
+def dataset_version(file: Path) -> str:
+    """Key for artifacts derived from a dataset file, changes whenever the file is replaced or modified."""
+    return f"{file.stem}-{int(file.stat().st_mtime)}"
+
+
+def artifact_lock(path: Path) -> threading.Lock:
+    """Lock of an artifact derived from a dataset, so concurrent first uses compute it only once."""
+    with _artifact_locks_guard:
+        return _artifact_locks.setdefault(path, threading.Lock())
+
+
+def partitions_dir(short_name: str) -> Path:
+    """Location of the parquet partitions of the current dataset version (see `PartitionedDataset`)."""
+    return settings.data.dir / "partitions" / short_name / dataset_version(get_dataset_file(short_name))
+
+
+@profiled("get_dataset", lambda short_name: {"dataset": short_name})
+def get_dataset(short_name: str) -> pd.DataFrame:
+    file = get_dataset_file(short_name)
     df = pd.read_csv(file)
     return df
 
 
-def clean_column_name(name: str) -> str:
+def count_rows(file: Path, manifest: Path | None = None, chunk_size: int = 1 << 20) -> int:
     """
-    Clean a column name for display:
-    - Replace underscores with spaces
-    - Capitalize each word
-    - Strip extra spaces
+    Count the data rows of a csv file without parsing it:
+    - Uses the row counts of the partition manifest if the dataset was ingested into partitions
+    - Otherwise scans the raw bytes for line breaks in fixed size chunks
+    - Quoted fields spanning multiple lines are counted once per line
     """
-    name = re.sub(r"_+", " ", name)  # replace underscores
-    name = re.sub(r"\s+", " ", name)  # collapse multiple spaces
-    name = name.strip().title()  # title case
-    return name
+    if manifest is not None and manifest.exists():
+        return sum(part["rows"] for part in json.loads(manifest.read_text())["partitions"])
+
+    lines = 0
+    last = b"\n"
+    with open(file, "rb") as f:
+        while chunk := f.read(chunk_size):
+            lines += chunk.count(b"\n")
+            last = chunk[-1:]
+    if last != b"\n":
+        lines += 1  # last line without trailing newline
+    return max(lines - 1, 0)  # minus header
+
+
+def get_dataset_preview(short_name: str, n_rows: int = 5) -> tuple[pd.DataFrame, int]:
+    """Read only the first `n_rows` of a dataset together with its total row count."""
+    file = get_dataset_file(short_name)
+    df = pd.read_csv(file, nrows=n_rows)
+    return df, count_rows(file, partitions_dir(short_name) / MANIFEST)
 
 
 def infer_column_types(df: pd.DataFrame) -> dict[str, str]:
@@ -85,3 +133,130 @@ def infer_column_types(df: pd.DataFrame) -> dict[str, str]:
         column_types[col] = col_type
 
     return column_types
+
+
+POSITIVE_LABELS = {"1", "true", "yes", "y", "approved"}
+
+
+def find_column(df: pd.DataFrame, name: str) -> str | None:
+    """Resolve a configured column name against the (stripped, case-insensitive) frame columns."""
+    lookup = {str(col).strip().lower(): col for col in df.columns}
+    return lookup.get(name.strip().lower())
+
+
+def normalize_labels(series: pd.Series) -> pd.Series:
+    return series.astype(str).str.strip().str.lower()
+
+
+def positive_label(values: Iterable[str]) -> str:
+    """Pick the (normalized) value encoded as 1 among two label values, preferring well known positive values."""
+    values = sorted(values)
+    return next((v for v in values if v in POSITIVE_LABELS), values[-1])
+
+
+@dataclass
+class FeatureSpec:
+    """
+    Everything needed to encode raw rows into model inputs consistently,
+    no matter whether they come from one frame or from many chunks.
+    """
+
+    label: str
+    positive: str
+    sensitive: str | None
+    groups: list[str]
+    exclude: list[str]
+    numerical: dict[str, tuple[float, float]]  # column -> (mean, std)
+    categorical: dict[str, list[str]]  # column -> categories, the first one is the dropped reference
+
+    @property
+    def n_features(self) -> int:
+        return len(self.numerical) + sum(len(cats) - 1 for cats in self.categorical.values())
+
+
+def fit_feature_spec(chunks: Iterable[pd.DataFrame], short_name: str) -> FeatureSpec:
+    """
+    Collect the encoding of a dataset in a single pass over its chunks:
+    - Column kinds are taken from the first chunk, numeric columns get a running mean/std
+    - Categories, label values and sensitive groups are gathered from all chunks
+    """
+    data_cfg = settings.dataset[short_name]
+    spec = None
+    stats: dict[str, np.ndarray] = {}  # column -> [count, sum, sum of squares]
+    labels: set[str] = set()
+    groups: set[str] = set()
+    categories: dict[str, set[str]] = {}
+
+    for df in chunks:
+        if spec is None:
+            label_col = find_column(df, data_cfg.label)
+            if label_col is None:
+                raise KeyError(f"Label column '{data_cfg.label}' not found in dataset '{short_name}'")
+            exclude = [find_column(df, c) for c in data_cfg.get("exclude", []) if find_column(df, c) is not None]
+            features = df.drop(columns=[label_col, *exclude])
+            numerical = features.select_dtypes(include="number").columns.tolist()
+            spec = FeatureSpec(
+                label=label_col,
+                positive="",
+                sensitive=find_column(df, data_cfg.get("sensitive", "")),
+                groups=[],
+                exclude=exclude,
+                numerical={col: (0.0, 1.0) for col in numerical},
+                categorical={col: [] for col in features.columns if col not in numerical},
+            )
+            stats = {col: np.zeros(3) for col in numerical}
+            categories = {col: set() for col in spec.categorical}
+
+        labels.update(normalize_labels(df[spec.label]).unique())
+        if spec.sensitive is not None:
+            groups.update(df[spec.sensitive].astype(str).str.strip().unique())
+        for col in stats:
+            values = pd.to_numeric(df[col], errors="coerce").dropna().to_numpy(dtype=np.float64)
+            stats[col] += (len(values), values.sum(), np.square(values).sum())
+        for col in categories:
+            categories[col].update(df[col].dropna().astype(str).unique())
+
+    if spec is None:
+        raise ValueError(f"Dataset '{short_name}' is empty")
+    if len(labels) != 2:
+        raise ValueError(f"Label column '{spec.label}' is not binary: {sorted(labels)}")
+
+    spec.positive = positive_label(labels)
+    spec.groups = sorted(groups)
+    spec.categorical = {col: sorted(cats) for col, cats in categories.items()}
+    for col, (count, total, squares) in stats.items():
+        mean = total / count if count else 0.0
+        std = np.sqrt(max(squares / count - mean**2, 0.0)) if count else 0.0
+        spec.numerical[col] = (float(mean), float(std) if std > 0 else 1.0)
+    return spec
+
+
+def transform_features(df: pd.DataFrame, spec: FeatureSpec) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Turn raw rows into model inputs:
+    - X: one-hot encoded, standardized feature matrix (float32), missing values become the mean (0)
+    - y: binary label (int8)
+    - A: sensitive attribute as group codes (int32), all zeros if none is configured
+    """
+    X = np.zeros((len(df), spec.n_features), dtype=np.float32)
+    for i, (col, (mean, std)) in enumerate(spec.numerical.items()):
+        X[:, i] = (pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=np.float64) - mean) / std
+    i = len(spec.numerical)
+    for col, cats in spec.categorical.items():
+        codes = pd.Categorical(df[col].astype(str), categories=cats).codes
+        for code in range(1, len(cats)):
+            X[:, i] = codes == code
+            i += 1
+    X = np.nan_to_num(X, nan=0.0)
+
+    y = (normalize_labels(df[spec.label]) == spec.positive).to_numpy(dtype=np.int8)
+    if spec.sensitive is not None:
+        A = pd.Categorical(df[spec.sensitive].astype(str).str.strip(), categories=spec.groups).codes.astype(np.int32)
+    else:
+        A = np.zeros(len(df), dtype=np.int32)
+    return X, y, A
+
+
+def prepare_features(df: pd.DataFrame, short_name: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Encode an in-memory dataset, see `transform_features`."""
+    return transform_features(df, fit_feature_spec([df], short_name))
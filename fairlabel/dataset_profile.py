@@ -0,0 +1,103 @@
+import json
+import os
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fairlabel.config import settings
+from fairlabel.data import artifact_lock, dataset_version, get_dataset_file, infer_column_types
+from fairlabel.formats import clean_column_name
+from fairlabel.log import logger
+
+MAX_TRACKED_VALUES = 1000  # distinct values counted per column before it only counts as "many"
+TOP_VALUES = 10
+HISTOGRAM_BINS = 20
+
+_profiles: dict[Path, dict] = {}
+
+
+def profile_file(short_name: str) -> Path:
+    """Location of the profile artifact of the current dataset version (file name and modification time)."""
+    file = get_dataset_file(short_name)
+    return settings.data.dir / "profiles" / short_name / f"{dataset_version(file)}.json"
+
+
+def get_dataset_profile(short_name: str) -> dict:
+    """
+    Profile of a dataset, computed once per dataset version and stored as a small json artifact:
+    {"rows": int, "columns": {column: {"name", "type", "nulls", "unique", "min", "max", "histogram"/"top"}}}
+    Later calls are served from memory or from the artifact without touching the raw data.
+    Concurrent first calls (wizard, sidebar, label import) wait for a single computation.
+    """
+    path = profile_file(short_name)
+    if path in _profiles:
+        return _profiles[path]
+
+    with artifact_lock(path):
+        if path in _profiles:
+            return _profiles[path]
+        if path.exists():
+            profile = json.loads(path.read_text())
+        else:
+            profile = compute_profile(get_dataset_file(short_name))
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(profile, indent=2))
+            os.replace(tmp, path)  # readers in other processes never see a partial file
+            logger.info(f"Dataset profile of {short_name} written to {path}")
+        _profiles[path] = profile
+    return profile
+
+
+def compute_profile(file: Path, chunk_rows: int = 200_000) -> dict:
+    """
+    Profile a csv file in two chunked passes, so memory stays bounded by the chunk size:
+    - Pass 1: column types (inferred on the first chunk), null counts, distinct values, min/max
+    - Pass 2: histograms of the numerical columns over the min/max range of pass 1
+    Later chunks may parse a column differently than the first one (e.g. a stray text token),
+    so numerical values are always coerced and everything that is not a number is skipped.
+    """
+    columns: dict[str, dict] = {}
+    values: dict[str, Counter] = {}
+    rows = 0
+    for chunk in pd.read_csv(file, chunksize=chunk_rows):
+        if not columns:
+            for col, col_type in infer_column_types(chunk).items():
+                columns[col] = {"name": clean_column_name(col), "type": col_type, "nulls": 0, "min": None, "max": None}
+                values[col] = Counter()
+        rows += len(chunk)
+        for col, info in columns.items():
+            series = chunk[col]
+            info["nulls"] += int(series.isna().sum())
+            if values[col] is not None:
+                counts = series.value_counts()
+                values[col].update(dict(zip(counts.index.astype(str), counts.tolist())))
+                if len(values[col]) > MAX_TRACKED_VALUES:
+                    values[col] = None
+            if info["type"] == "numerical" or pd.api.types.is_numeric_dtype(series):
+                numbers = pd.to_numeric(series, errors="coerce")
+                if numbers.notna().any():
+                    low, high = float(numbers.min()), float(numbers.max())
+                    info["min"] = low if info["min"] is None else min(info["min"], low)
+                    info["max"] = high if info["max"] is None else max(info["max"], high)
+
+    for col, info in columns.items():
+        counts = values[col]
+        info["unique"] = len(counts) if counts is not None else None  # None: more than MAX_TRACKED_VALUES
+        if info["type"] != "numerical" and counts is not None:
+            info["top"] = dict(counts.most_common(TOP_VALUES))
+
+    numerical = [col for col, info in columns.items() if info["type"] == "numerical" and info["min"] is not None]
+    edges = {col: np.linspace(columns[col]["min"], columns[col]["max"], HISTOGRAM_BINS + 1) for col in numerical}
+    histograms = {col: np.zeros(HISTOGRAM_BINS, dtype=np.int64) for col in numerical}
+    if numerical:
+        for chunk in pd.read_csv(file, usecols=numerical, chunksize=chunk_rows):
+            for col in numerical:
+                numbers = pd.to_numeric(chunk[col], errors="coerce").dropna()
+                histograms[col] += np.histogram(numbers, bins=edges[col])[0]
+    for col in numerical:
+        columns[col]["histogram"] = {"edges": edges[col].tolist(), "counts": histograms[col].tolist()}
+
+    return {"rows": rows, "columns": columns}
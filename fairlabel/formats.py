@@ -0,0 +1,32 @@
+"""
+Label formats and display names the web modules need on the event loop.
+Kept free of pandas, numpy and scikit-learn, so importing it never waits for the heavy modules (see `preload`).
+"""
+
+import re
+
+LABEL_FORMATS = {
+    "text/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/vnd.apache.arrow.stream": "arrow",
+    "application/vnd.apache.arrow.file": "arrow",
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+}
+
+
+def clean_column_name(name: str) -> str:
+    """
+    Clean a column name for display:
+    - Replace underscores with spaces
+    - Capitalize each word
+    - Strip extra spaces
+    """
+    name = re.sub(r"_+", " ", name)  # replace underscores
+    name = re.sub(r"\s+", " ", name)  # collapse multiple spaces
+    name = name.strip().title()  # title case
+    return name
@@ -0,0 +1,57 @@
+import argparse
+import subprocess
+import sys
+
+from fairlabel.log import logger
+
+MODULE = "fairlabel.web.server"
+BUDGET_S = 2.0
+# Must not be imported before the first use, the web modules import them lazily (see `preload` in web/server.py)
+HEAVY_MODULES = ("pandas", "scipy", "sklearn", "kagglehub", "pyarrow")
+
+
+def measure(module: str = MODULE) -> tuple[float, dict[str, int], set[str]]:
+    """
+    Cold import of `module` in a fresh interpreter with `-X importtime`.
+    Returns the total seconds, the cumulative microseconds per imported module and the heavy modules that were loaded.
+    """
+    code = f"import sys, {module}; print(*sorted(set(m.partition('.')[0] for m in sys.modules)))"
+    command = [sys.executable, "-X", "importtime", "-c", code]
+    result = subprocess.run(command, capture_output=True, text=True, check=True)
+
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, micros, name = line.split("|")
+        cumulative[name.strip()] = int(micros)
+    loaded = set(result.stdout.split()) & set(HEAVY_MODULES)
+    return cumulative[module] / 1e6, cumulative, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fail if the cold import of the web server exceeds its budget.")
+    parser.add_argument("--module", default=MODULE)
+    parser.add_argument("--budget", type=float, default=BUDGET_S, help="seconds")
+    parser.add_argument("--repeat", type=int, default=3, help="the fastest of these runs counts")
+    parser.add_argument("--top", type=int, default=10, help="slowest imports listed on failure")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    seconds, cumulative, loaded = min(runs, key=lambda run: run[0])
+    logger.info(f"Cold import of {args.module}: {seconds:.2f}s (budget {args.budget:.2f}s)")
+
+    failed = False
+    if loaded:
+        logger.error(f"Heavy modules imported eagerly: {', '.join(sorted(loaded))}")
+        failed = True
+    if seconds > args.budget:
+        slowest = sorted(cumulative.items(), key=lambda item: item[1], reverse=True)[1 : args.top + 1]
+        report = "\n".join(f"{us / 1e3:8.0f} ms  {name}" for name, us in slowest)
+        logger.error(f"Import budget exceeded, slowest imports (cumulative):\n{report}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+from sklearn.cluster import MiniBatchKMeans
+from sklearn.neighbors import NearestNeighbors
+
+from fairlabel.log import logger
+
+INDEX_FILE = "index.npz"
+
+
+@dataclass
+class FeatureIndex:
+    """
+    Neighborhood structure of a preprocessed feature matrix, built once per dataset:
+    - clusters: k-means cluster per row, centroids: the cluster centers
+    - density: 1 / (1 + mean distance to the `n_neighbors` nearest rows of a reference sample)
+    """
+
+    features: np.ndarray
+    clusters: np.ndarray
+    centroids: np.ndarray
+    density: np.ndarray
+
+    @classmethod
+    def build(
+        cls,
+        features: np.ndarray,
+        n_clusters: int | None = None,
+        n_neighbors: int = 10,
+        sample_size: int = 20_000,
+        seed: int = 0,
+    ) -> "FeatureIndex":
+        """
+        Cluster the rows and estimate their density. Neighbors are searched in a random sample
+        of at most `sample_size` rows, which keeps the cost linear in the number of rows.
+        """
+        n_rows = len(features)
+        n_clusters = n_clusters or int(np.clip(np.sqrt(n_rows / 2), 2, 256))
+        rng = np.random.default_rng(seed)
+        sample_rows = np.sort(rng.choice(n_rows, size=min(sample_size, n_rows), replace=False))
+        sample = features[sample_rows]
+
+        kmeans = MiniBatchKMeans(n_clusters=min(n_clusters, len(sample)), random_state=seed, n_init=3)
+        kmeans.fit(sample)
+
+        # One extra neighbor is queried: rows of the sample find themselves (distance 0), which is dropped,
+        # for all other rows the farthest one is dropped, so every row is rated on `n_neighbors` others
+        n_neighbors = min(n_neighbors, len(sample) - 1)
+        neighbors = NearestNeighbors(n_neighbors=n_neighbors + 1).fit(sample)
+        sample_position = np.full(n_rows, -1, dtype=np.int64)
+        sample_position[sample_rows] = np.arange(len(sample_rows))
+
+        density = np.empty(n_rows, dtype=np.float32)
+        clusters = np.empty(n_rows, dtype=np.int32)
+        for start in range(0, n_rows, sample_size):
+            batch = np.asarray(features[start : start + sample_size])
+            dist, idx = neighbors.kneighbors(batch)
+            is_self = idx == sample_position[start : start + len(batch), None]
+            keep = ~is_self
+            keep[~is_self.any(axis=1), -1] = False
+            dist = dist[keep].reshape(len(batch), n_neighbors)
+            density[start : start + len(batch)] = 1 / (1 + dist.mean(axis=1))
+            clusters[start : start + len(batch)] = kmeans.predict(batch)
+        return cls(features=features, clusters=clusters, centroids=kmeans.cluster_centers_, density=density)
+
+    def save(self, directory: Path):
+        """Store the index next to the feature matrix it was built from (the features are not duplicated)."""
+        np.savez(directory / INDEX_FILE, clusters=self.clusters, centroids=self.centroids, density=self.density)
+
+    @classmethod
+    def load(cls, directory: Path, features: np.ndarray) -> "FeatureIndex":
+        with np.load(directory / INDEX_FILE) as data:
+            return cls(
+                features=features, clusters=data["clusters"], centroids=data["centroids"], density=data["density"]
+            )
+
+    @classmethod
+    def load_or_build(cls, directory: Path, features: np.ndarray) -> "FeatureIndex":
+        if (directory / INDEX_FILE).exists():
+            return cls.load(directory, features)
+        logger.info(f"Building feature index for {len(features)} rows in {directory}")
+        index = cls.build(features)
+        index.save(directory)
+        return index
@@ -0,0 +1,336 @@
+import io
+from collections.abc import Callable
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy.stats import spearmanr
+from sklearn.base import BaseEstimator, clone
+from sklearn.ensemble import HistGradientBoostingClassifier
+from sklearn.linear_model import LogisticRegression
+
+from fairlabel.config import settings
+from fairlabel.data import (
+    artifact_lock,
+    dataset_version,
+    get_dataset,
+    get_dataset_file,
+    normalize_labels,
+    positive_label,
+    prepare_features,
+)
+from fairlabel.dataset_profile import get_dataset_profile
+from fairlabel.index import FeatureIndex
+from fairlabel.mitigation import WarmFairnessMitigator, demographic_parity_difference
+from fairlabel.partitions import ROW_ID, PartitionedDataset
+from fairlabel.profiling import profiled
+from fairlabel.strategies import NEEDS_INDEX, SCORES, STRATEGIES, QueryContext, positive_proba, select_batch
+
+
+def parse_labels(data: bytes, fmt: str) -> pd.DataFrame:
+    """
+    Read a label file with the columns `row_id` (row position in the dataset) and `label`.
+    Supported formats: csv, json lines and arrow (ipc file or stream, requires pyarrow).
+    """
+    if fmt == "csv":
+        df = pd.read_csv(io.BytesIO(data))
+    elif fmt == "jsonl":
+        df = pd.read_json(io.BytesIO(data), lines=True)
+    elif fmt == "arrow":
+        import pyarrow as pa
+
+        try:
+            table = pa.ipc.open_file(pa.BufferReader(data)).read_all()
+        except pa.ArrowInvalid:
+            table = pa.ipc.open_stream(pa.BufferReader(data)).read_all()
+        df = table.to_pandas()
+    else:
+        raise ValueError(f"Unsupported label format '{fmt}', use one of: csv, jsonl, arrow")
+
+    missing = {"row_id", "label"} - set(df.columns)
+    if missing:
+        raise ValueError(f"Label file is missing the column(s): {', '.join(sorted(missing))}")
+    return df[["row_id", "label"]]
+
+
+def validate_labels(df: pd.DataFrame, short_name: str) -> dict[int, int]:
+    """
+    Check a whole batch of labels at once and map it to {row id: 0/1}.
+    Labels may be given as 0/1 or as the label values of the dataset (case insensitive).
+    Raises a ValueError listing all problems, nothing is applied partially.
+    """
+    profile = get_dataset_profile(short_name)
+    label_name = settings.dataset[short_name].label.strip().lower()
+    label_info = next((info for col, info in profile["columns"].items() if col.strip().lower() == label_name), {})
+    values = {str(v).strip().lower() for v in label_info.get("top", {})}
+    positive = positive_label(values) if len(values) == 2 else "1"
+    allowed = values | {"0", "1"}
+
+    row_ids = pd.to_numeric(df["row_id"], errors="coerce")
+    labels = normalize_labels(df["label"])
+    errors = []
+    if (bad := row_ids.isna() | (row_ids % 1 != 0)).any():
+        errors.append(f"{bad.sum()} row ids are not integers")
+    elif (bad := (row_ids < 0) | (row_ids >= profile["rows"])).any():
+        errors.append(f"{bad.sum()} row ids are outside of 0..{profile['rows'] - 1}")
+    if (bad := ~labels.isin(allowed)).any():
+        errors.append(f"{bad.sum()} labels are not one of {sorted(allowed)}, e.g. '{df['label'][bad].iloc[0]}'")
+    if not errors and (bad := row_ids.duplicated()).any():
+        errors.append(f"{bad.sum()} row ids are labeled more than once, e.g. {int(row_ids[bad].iloc[0])}")
+    if errors:
+        raise ValueError("; ".join(errors))
+
+    encoded = labels.isin({positive, "1"}).astype(int)
+    return dict(zip(row_ids.astype(int).tolist(), encoded.tolist()))
+
+
+def read_labels(data: bytes, fmt: str, short_name: str) -> dict[int, int]:
+    """Parse and validate a whole label batch, see `parse_labels` and `validate_labels`."""
+    return validate_labels(parse_labels(data, fmt), short_name)
+
+
+@lru_cache(maxsize=4)
+def load_features(short_name: str) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Model inputs of a dataset, kept for the next retrain."""
+    return prepare_features(get_dataset(short_name), short_name)
+
+
+@lru_cache(maxsize=4)
+def load_index(short_name: str) -> FeatureIndex:
+    """Feature index of the in-memory features for the neighborhood based strategies, built once per dataset version."""
+    directory = settings.data.dir / "index" / short_name / dataset_version(get_dataset_file(short_name))
+    with artifact_lock(directory):
+        directory.mkdir(parents=True, exist_ok=True)
+        return FeatureIndex.load_or_build(directory, load_features(short_name)[0])
+
+
+def open_partitions(short_name: str) -> PartitionedDataset | None:
+    """The on-disk pool if `partitions.enabled` is set (ingested on first use), otherwise None."""
+    if not settings.partitions.enabled:
+        return None
+    return PartitionedDataset.ingest(short_name, chunk_rows=int(settings.partitions.chunk_rows))
+
+
+def _labeled_arrays(labels: dict[int, int]) -> tuple[np.ndarray, np.ndarray]:
+    labeled = np.fromiter(labels.keys(), dtype=np.int64, count=len(labels))
+    y = np.fromiter(labels.values(), dtype=np.int64, count=len(labels))
+    return labeled, y
+
+
+def labeled_features(short_name: str, labels: dict[int, int]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Features, labels and sensitive groups of the labeled rows, only these rows are read from partitions."""
+    labeled, y = _labeled_arrays(labels)
+    if (dataset := open_partitions(short_name)) is not None:
+        X, _, A = dataset.features(labeled)
+        return X, y, A
+    X, _, A = load_features(short_name)
+    return X[labeled], y, A[labeled]
+
+
+def sample_pool(short_name: str, labels: dict[int, int], size: int, rng: np.random.Generator) -> np.ndarray:
+    """Features of at most `size` random unlabeled rows."""
+    labeled, _ = _labeled_arrays(labels)
+    if (dataset := open_partitions(short_name)) is not None:
+        row_ids = rng.choice(len(dataset), size=min(size + len(labeled), len(dataset)), replace=False)
+        return dataset.features(row_ids[~np.isin(row_ids, labeled)][:size])[0]
+    X, _, _ = load_features(short_name)
+    pool = np.setdiff1d(np.arange(len(X)), labeled)
+    return X[rng.choice(pool, size=min(size, len(pool)), replace=False)]
+
+
+def rank_pool(
+    short_name: str,
+    labels: dict[int, int],
+    labeled_groups: np.ndarray,
+    proba: Callable[[np.ndarray], np.ndarray],
+    n_candidates: int = 10,
+    strategy: str = "fair_hybrid",
+) -> list[int]:
+    """
+    Rank the unlabeled rows with the positive class probabilities from `proba`, return the best row ids.
+    With partitions the pool is scored partition by partition and never held in memory as a whole,
+    which only works for score strategies that do not need the feature index (see `NEEDS_INDEX`).
+    """
+    labeled, _ = _labeled_arrays(labels)
+    rng = np.random.default_rng()
+    if (dataset := open_partitions(short_name)) is not None:
+        if strategy not in SCORES or strategy in NEEDS_INDEX:
+            raise ValueError(f"Strategy '{strategy}' needs the pool in memory, it is not available with partitions")
+        best = dataset.score_candidates(proba, SCORES[strategy], n_candidates, labeled, labeled_groups, rng)
+        return best[ROW_ID].tolist()
+
+    X, _, A = load_features(short_name)
+    pool = np.setdiff1d(np.arange(len(X)), labeled)
+    ctx = QueryContext(
+        proba=proba(X[pool]),
+        groups=A[pool],
+        labeled_groups=labeled_groups,
+        rng=rng,
+        pool=pool,
+        labeled=labeled,
+        index=load_index(short_name) if strategy in NEEDS_INDEX else None,
+    )
+    return pool[STRATEGIES[strategy](ctx, n_candidates)].tolist()
+
+
+@profiled(
+    "train_and_score",
+    lambda short_name, estimator, labels, *args, **kwargs: {
+        "dataset": short_name,
+        "model": type(estimator).__name__,
+        "n_labeled": len(labels),
+    },
+)
+def train_and_score(
+    short_name: str,
+    estimator: BaseEstimator,
+    labels: dict[int, int],
+    n_candidates: int = 10,
+    strategy: str = "fair_hybrid",
+) -> tuple[BaseEstimator | None, list[int]]:
+    """
+    Fit a fresh copy of the estimator on all labeled rows and rank the unlabeled rows.
+    Returns the fitted model (None while only one class is labeled) and the next candidate row ids.
+    """
+    X, y, A = labeled_features(short_name, labels)
+    model = None
+    if len(np.unique(y)) == 2:
+        model = clone(estimator).fit(X, y)
+    candidates = rank_pool(short_name, labels, A, lambda X_pool: positive_proba(model, X_pool), n_candidates, strategy)
+    return model, candidates
+
+
+@profiled(
+    "train_model",
+    lambda short_name, estimator, labels: {
+        "dataset": short_name,
+        "model": type(estimator).__name__,
+        "n_labeled": len(labels),
+    },
+)
+def train_model(short_name: str, estimator: BaseEstimator, labels: dict[int, int]) -> BaseEstimator | None:
+    """Fit a fresh copy of the estimator on all labeled rows without ranking the pool (None while one class)."""
+    X, y, _ = labeled_features(short_name, labels)
+    if len(np.unique(y)) < 2:
+        return None
+    return clone(estimator).fit(X, y)
+
+
+@profiled(
+    "update_mitigator",
+    lambda short_name, mitigator, estimator, labels: {"dataset": short_name, "n_labeled": len(labels)},
+)
+def update_mitigator(
+    short_name: str,
+    mitigator: WarmFairnessMitigator | None,
+    estimator: BaseEstimator,
+    labels: dict[int, int],
+) -> tuple[WarmFairnessMitigator | None, dict]:
+    """
+    Continue the fairness mitigation of the estimator on all labeled rows (created on first use).
+    Returns the mitigator and a report on the labeled rows, both unchanged while only one class is labeled.
+    """
+    X, y, A = labeled_features(short_name, labels)
+    if len(np.unique(y)) < 2:
+        return mitigator, {}
+    if mitigator is None:
+        mitigator = WarmFairnessMitigator(clone(estimator), eps=float(settings.mitigation.eps))
+    y_fair = mitigator.update(X, y, A).predict(X)
+    report = {
+        "n_labeled": len(labels),
+        "n_fits": mitigator.n_fits,
+        "accuracy": float((y_fair == y).mean()),
+        "dp_difference": demographic_parity_difference(y_fair, A),
+    }
+    return mitigator, report
+
+
+# --- Proxy scoring ---
+# A cheap surrogate is refit on every label and ranks the pool, while the configured (heavy)
+# model is only retrained every few labels. After each heavy retrain the surrogate probabilities
+# are mapped onto the heavy model's with a logit-linear fit, and the ranking agreement is reported.
+PROXY_MODELS: dict[str, Callable[[], BaseEstimator]] = {
+    "linear": lambda: LogisticRegression(C=10.0, max_iter=200),
+    "hist_gradient_boosting": lambda: HistGradientBoostingClassifier(max_iter=50),
+}
+
+
+@dataclass
+class LogitCalibration:
+    """Monotone map logit(p) -> slope * logit(p) + intercept, keeps the ranking resolution of the surrogate."""
+
+    slope: float
+    intercept: float
+
+    @staticmethod
+    def logit(p: np.ndarray) -> np.ndarray:
+        p = np.clip(p, 1e-6, 1 - 1e-6)
+        return np.log(p / (1 - p))
+
+    @classmethod
+    def fit(cls, proba: np.ndarray, target: np.ndarray) -> "LogitCalibration":
+        slope, intercept = np.polyfit(cls.logit(proba), cls.logit(target), deg=1)
+        return cls(slope=float(slope), intercept=float(intercept))
+
+    def predict(self, proba: np.ndarray) -> np.ndarray:
+        return 1 / (1 + np.exp(-(self.slope * self.logit(proba) + self.intercept)))
+
+
+def proxy_proba(proxy: BaseEstimator | None, calibration: LogitCalibration | None, X: np.ndarray) -> np.ndarray:
+    proba = positive_proba(proxy, X)
+    return calibration.predict(proba) if calibration is not None and proxy is not None else proba
+
+
+@profiled(
+    "train_proxy_and_score",
+    lambda short_name, labels, kind, *args, **kwargs: {"dataset": short_name, "model": kind, "n_labeled": len(labels)},
+)
+def train_proxy_and_score(
+    short_name: str,
+    labels: dict[int, int],
+    kind: str,
+    calibration: LogitCalibration | None = None,
+    n_candidates: int = 10,
+    strategy: str = "fair_hybrid",
+) -> tuple[BaseEstimator | None, list[int]]:
+    """Refit the surrogate on all labels and rank the pool with its (calibrated) probabilities."""
+    X, y, A = labeled_features(short_name, labels)
+    proxy = None
+    if len(np.unique(y)) == 2:
+        proxy = PROXY_MODELS[kind]().fit(X, y)
+    candidates = rank_pool(
+        short_name, labels, A, lambda X_pool: proxy_proba(proxy, calibration, X_pool), n_candidates, strategy
+    )
+    return proxy, candidates
+
+
+def calibrate_proxy(
+    short_name: str,
+    proxy: BaseEstimator,
+    model: BaseEstimator,
+    labels: dict[int, int],
+    sample_size: int = 5000,
+    top_k: int = 10,
+) -> tuple[LogitCalibration, dict]:
+    """
+    Map surrogate onto heavy model probabilities on a sample of the pool and measure how well
+    the calibrated surrogate reproduces the heavy model's uncertainty ranking:
+    - spearman: rank correlation of the uncertainty scores
+    - top_k_overlap: share of the heavy model's `top_k` most uncertain rows the surrogate also ranks in its top `top_k`
+    """
+    sample = sample_pool(short_name, labels, sample_size, np.random.default_rng())
+
+    proxy_scores, full_scores = positive_proba(proxy, sample), positive_proba(model, sample)
+    calibration = LogitCalibration.fit(proxy_scores, full_scores)
+
+    proxy_uncertainty = 1 - np.abs(calibration.predict(proxy_scores) - 0.5)
+    full_uncertainty = 1 - np.abs(full_scores - 0.5)
+    k = min(top_k, len(sample))
+    overlap = np.intersect1d(select_batch(proxy_uncertainty, k), select_batch(full_uncertainty, k))
+    agreement = {
+        "n_labeled": len(labels),
+        "spearman": float(spearmanr(proxy_uncertainty, full_uncertainty).statistic),
+        "top_k_overlap": len(overlap) / k if k else 1.0,
+    }
+    return calibration, agreement
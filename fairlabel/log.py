@@ -1,16 +1,67 @@
+import atexit
 import logging
+import queue
+import random
+import threading
+import time
 from logging import StreamHandler
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from fairlabel.config import settings
 
 formatter = logging.Formatter("%(asctime)s : %(levelname)-8s [%(filename)-13s:%(lineno)-3d] %(message)s")
 
-logger = logging.getLogger(__name__)
+
+class SamplingFilter(logging.Filter):
+    """
+    Thins out log calls on hot paths, opt-in per call via `extra`:
+    - `extra={"every": 5.0}` logs the call site at most once every 5 seconds
+    - `extra={"sample": 0.01}` logs roughly 1% of the calls
+    Records passed after suppression report how many calls were skipped in between.
+    Thread-safe, log calls also come from the worker threads of `run.io_bound`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._lock = threading.Lock()
+        self._last: dict[tuple[str, int], float] = {}
+        self._skipped: dict[tuple[str, int], int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        every = getattr(record, "every", None)
+        sample = getattr(record, "sample", None)
+        if every is None and sample is None:
+            return True
+
+        site = (record.pathname, record.lineno)
+        sampled_out = sample is not None and random.random() >= sample
+        with self._lock:
+            now = time.monotonic()
+            if sampled_out or (every is not None and now - self._last.get(site, -every) < every):
+                self._skipped[site] = self._skipped.get(site, 0) + 1
+                return False
+            self._last[site] = now
+            skipped = self._skipped.pop(site, 0)
+        if skipped:
+            record.msg = f"{record.msg} [{skipped} similar suppressed]"
+        return True
+
+
+class DeferredQueueHandler(QueueHandler):
+    """Hands records to the listener thread unformatted, formatting happens there."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Merge the arguments now, they might change before the listener gets to the record
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+handlers: list[logging.Handler] = []
 if settings.logging.stream:
     stream_handler = StreamHandler()
     stream_handler.setFormatter(formatter)
-    logger.addHandler(stream_handler)
+    handlers.append(stream_handler)
 
 if settings.logging.file:
     log_size_byte = 1024 * int(settings.logging.size_kb)
@@ -20,6 +71,20 @@ if settings.logging.file:
         backupCount=5,
     )
     file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
+    handlers.append(file_handler)
+
+logger = logging.getLogger(__name__)
+logger.addFilter(SamplingFilter())
+
+if settings.logging.queue:
+    # I/O and formatting happen on the listener thread, log calls only enqueue the record
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    logger.addHandler(DeferredQueueHandler(log_queue))
+    listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+else:
+    for handler in handlers:
+        logger.addHandler(handler)
 
 logger.setLevel(getattr(logging, settings.logging.level))
@@ -0,0 +1,188 @@
+"""
+Demographic parity mitigation that can be updated while labels accumulate.
+
+Follows the reduction of fairlearn's `ExponentiatedGradient` with `DemographicParity` (as used in EBM.py):
+the Lagrangian of "minimize error subject to |P(h=1|A=a) - P(h=1)| <= eps" is approached by alternating
+weighted fits of the base estimator (best response) with exponentiated gradient steps on the multipliers.
+It is a simplified variant, not a drop-in replacement:
+- The model is a uniform vote over the last `max_predictors` best responses, not fairlearn's weighted mixture
+- Predictions are deterministic (majority vote), fairlearn's `predict` samples from the mixture
+- Fitting stops as soon as the vote satisfies the constraints, not when the duality gap is small
+In exchange the multipliers and predictors survive between fits, so after a new labeling batch
+the optimization continues from the previous state instead of starting from zero.
+
+    python -m fairlabel.mitigation loan_prediction --label-counts 200 400 800 1600
+"""
+
+import argparse
+import time
+
+import numpy as np
+from sklearn.base import BaseEstimator, clone
+from sklearn.model_selection import train_test_split
+
+from fairlabel.config import settings
+from fairlabel.data import get_dataset, prepare_features
+from fairlabel.log import logger
+from fairlabel.models import MODELS
+
+
+def demographic_parity_difference(y_pred: np.ndarray, groups: np.ndarray) -> float:
+    """Largest gap in selection rate (share of positive predictions) between any two groups."""
+    rates = [y_pred[groups == g].mean() for g in np.unique(groups)]
+    return float(max(rates) - min(rates))
+
+
+class WarmFairnessMitigator:
+    """
+    Demographic parity mitigator with warm-started updates.
+
+    `update(X, y, A)` may be called repeatedly with a growing labeled set. The multipliers (theta)
+    continue from the last call and the last `max_predictors` predictors stay part of the mixture,
+    re-evaluated on the new data. New best responses are only fit until the mixture satisfies the
+    constraints again, which after a small batch of new labels usually takes one or two fits.
+    """
+
+    def __init__(
+        self,
+        estimator: BaseEstimator,
+        eps: float = 0.01,
+        bound: float = 100.0,
+        eta: float = 2.0,
+        max_iter: int = 50,
+        max_predictors: int = 10,
+    ):
+        self.estimator = estimator
+        self.eps = eps
+        self.bound = bound
+        self.eta = eta
+        self.max_iter = max_iter
+        self.max_predictors = max_predictors
+
+        self.groups: np.ndarray | None = None
+        self.theta: np.ndarray | None = None  # log multipliers, (upper, lower) constraint per group
+        self.predictors: list[BaseEstimator] = []
+        self.n_fits = 0  # best responses fitted during the last update
+
+    def multipliers(self) -> np.ndarray:
+        exp_theta = np.exp(self.theta)
+        return self.bound * exp_theta / (1 + exp_theta.sum())
+
+    def violations(self, h: np.ndarray, group_index: np.ndarray) -> np.ndarray:
+        """Signed constraint values per group, upper bounds first: P(h|A=a) - P(h) and P(h) - P(h|A=a)."""
+        overall = h.mean()
+        by_group = np.array([h[group_index == g].mean() for g in range(len(self.groups))])
+        return np.r_[by_group - overall, overall - by_group]
+
+    def best_response(self, X: np.ndarray, y: np.ndarray, group_index: np.ndarray, shares: np.ndarray):
+        """Fit the base estimator on the cost sensitive problem induced by the current multipliers."""
+        lam = self.multipliers()
+        k = len(self.groups)
+        lam_group = lam[:k] - lam[k:]
+        # Cost of predicting 1 instead of 0 for every sample: error term + constraint term
+        cost = np.where(y == 0, 1.0, -1.0) + lam_group[group_index] / shares[group_index] - lam_group.sum()
+        target = (cost < 0).astype(int)
+        if len(np.unique(target)) < 2:
+            predictor = _ConstantPredictor(int(target[0]))
+        else:
+            predictor = clone(self.estimator).fit(X, target, sample_weight=np.abs(cost))
+        return predictor
+
+    def update(self, X: np.ndarray, y: np.ndarray, A: np.ndarray) -> "WarmFairnessMitigator":
+        groups, group_index = np.unique(A, return_inverse=True)
+        if self.groups is None or not np.array_equal(groups, self.groups):
+            # New groups invalidate the multipliers, start cold
+            self.groups = groups
+            self.theta = np.zeros(2 * len(groups))
+            self.predictors = []
+        shares = np.bincount(group_index, minlength=len(groups)) / len(group_index)
+
+        # Predictions of the retained predictors on the current labeled set
+        predictions = [p.predict(X) for p in self.predictors]
+        self.n_fits = 0
+        for _ in range(self.max_iter):
+            # At least one new best response, so the new labels always enter the mixture
+            if self.n_fits > 0 and self._converged(predictions, group_index):
+                break
+            predictor = self.best_response(X, y, group_index, shares)
+            h = predictor.predict(X)
+            self.predictors.append(predictor)
+            predictions.append(h)
+            self.n_fits += 1
+            # Step size relative to the multiplier bound as in fairlearn
+            self.theta += self.eta / self.bound * (self.violations(h, group_index) - self.eps)
+
+        self.predictors = self.predictors[-self.max_predictors :]
+        return self
+
+    def _converged(self, predictions: list[np.ndarray], group_index: np.ndarray) -> bool:
+        mixture = np.mean(predictions[-self.max_predictors :], axis=0)
+        return self.violations(mixture, group_index).max() <= self.eps
+
+    def predict_proba(self, X: np.ndarray) -> np.ndarray:
+        """Share of mixture predictors voting for the positive class."""
+        positive = np.mean([p.predict(X) for p in self.predictors], axis=0)
+        return np.c_[1 - positive, positive]
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return (self.predict_proba(X)[:, 1] >= 0.5).astype(int)
+
+
+class _ConstantPredictor:
+    def __init__(self, value: int):
+        self.value = value
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        return np.full(len(X), self.value)
+
+
+def benchmark(short_name: str, model_name: str, label_counts: list[int], batch_size: int, seed: int = 0) -> list[dict]:
+    """
+    Compare a cold mitigation fit with a warm update at each label count. The warm mitigator
+    has seen the labeled set without the last `batch_size` labels, like after a labeling batch.
+    """
+    X, y, A = prepare_features(get_dataset(short_name), short_name)
+    model_def = MODELS[model_name]
+    estimator = model_def.cls(**{p.name: p.default for p in model_def.hyperparameters})
+    order, _ = train_test_split(np.arange(len(y)), train_size=max(label_counts), random_state=seed, stratify=y)
+
+    results = []
+    for n in label_counts:
+        rows, previous = order[:n], order[: n - batch_size]
+
+        start = time.perf_counter()
+        cold = WarmFairnessMitigator(estimator).update(X[rows], y[rows], A[rows])
+        cold_time = time.perf_counter() - start
+
+        warm = WarmFairnessMitigator(estimator).update(X[previous], y[previous], A[previous])
+        start = time.perf_counter()
+        warm.update(X[rows], y[rows], A[rows])
+        warm_time = time.perf_counter() - start
+
+        results.append(
+            {
+                "n_labeled": n,
+                "cold_seconds": cold_time,
+                "cold_fits": cold.n_fits,
+                "warm_seconds": warm_time,
+                "warm_fits": warm.n_fits,
+            }
+        )
+        logger.info(
+            f"{n} labels: cold {cold_time:.3f}s ({cold.n_fits} fits), warm {warm_time:.3f}s ({warm.n_fits} fits)"
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold against warm-started fairness mitigation.")
+    parser.add_argument("dataset", choices=list(settings.dataset.keys()))
+    parser.add_argument("--model", default="Logistic Regression", choices=list(MODELS))
+    parser.add_argument("--label-counts", nargs="+", type=int, default=[200, 400, 800, 1600])
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+    benchmark(args.dataset, args.model, args.label_counts, args.batch_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,10 @@
+import importlib
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Type
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, List, Type
 
-from sklearn.base import BaseEstimator
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.linear_model import LogisticRegression
+if TYPE_CHECKING:
+    from sklearn.base import BaseEstimator
 
 
 @dataclass
@@ -19,14 +20,19 @@ class Hyperparameter:
 @dataclass
 class ModelDefinition:
     name: str
-    cls: Type[BaseEstimator]
+    cls_path: str  # "module:Class", imported on first use of `cls` to keep sklearn out of the server start
     hyperparameters: List[Hyperparameter]
 
+    @cached_property
+    def cls(self) -> Type["BaseEstimator"]:
+        module, _, name = self.cls_path.partition(":")
+        return getattr(importlib.import_module(module), name)
+
 
 MODELS = {
     "Logistic Regression": ModelDefinition(
         name="Logistic Regression",
-        cls=LogisticRegression,
+        cls_path="sklearn.linear_model:LogisticRegression",
         hyperparameters=[
             Hyperparameter(name="C", type="float", default=1.0, min=0.01, max=100.0),
             Hyperparameter(
@@ -39,7 +45,7 @@ MODELS = {
     ),
     "Random Forest": ModelDefinition(
         name="Random Forest",
-        cls=RandomForestClassifier,
+        cls_path="sklearn.ensemble:RandomForestClassifier",
         hyperparameters=[
             Hyperparameter(name="n_estimators", type="int", default=100, min=10, max=500),
             Hyperparameter(name="max_depth", type="int", default=10, min=1, max=100),
@@ -0,0 +1,147 @@
+import json
+import os
+import shutil
+import tempfile
+from collections.abc import Callable, Iterator
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from fairlabel.data import (
+    MANIFEST,
+    FeatureSpec,
+    artifact_lock,
+    fit_feature_spec,
+    get_dataset_file,
+    partitions_dir,
+    transform_features,
+)
+from fairlabel.log import logger
+from fairlabel.strategies import QueryContext, ScoreStrategy, select_batch
+
+ROW_ID = "_row_id"
+
+
+class PartitionedDataset:
+    """
+    Out-of-core view of a dataset that does not fit into memory.
+
+    The source csv is converted once into parquet partitions of `chunk_rows` rows each
+    (requires pyarrow). Every row keeps its position in the source as `_row_id`, so labels
+    can be stored as small (row id -> label) overlays while the pool itself stays on disk.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        manifest = json.loads((path / MANIFEST).read_text())
+        self.source = manifest["source"]
+        self.partitions: list[dict] = manifest["partitions"]
+        self.spec = FeatureSpec(**manifest["spec"])
+
+    def __len__(self) -> int:
+        return sum(part["rows"] for part in self.partitions)
+
+    @classmethod
+    def ingest(cls, short_name: str, chunk_rows: int = 500_000, row_group_rows: int = 100_000) -> "PartitionedDataset":
+        """
+        Convert the dataset csv into parquet partitions, reusing them while the csv is unchanged.
+
+        The csv is read twice in chunks: once to fit the feature encoding, once to write the partitions.
+        Neither pass holds more than one chunk in memory. The partitions are written into a temporary
+        directory that is moved into place when complete, so readers never see partly written files.
+        """
+        file = get_dataset_file(short_name)
+        path = partitions_dir(short_name)
+        with artifact_lock(path):
+            if not (path / MANIFEST).exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = Path(tempfile.mkdtemp(prefix=f".{path.name}-", dir=path.parent))
+                try:
+                    cls._write(file, short_name, tmp, chunk_rows, row_group_rows)
+                    if path.exists() and not (path / MANIFEST).exists():  # left by an interrupted ingestion
+                        shutil.rmtree(path)
+                    os.replace(tmp, path)
+                except OSError:
+                    if not (path / MANIFEST).exists():  # otherwise another process moved its partitions first
+                        raise
+                finally:
+                    shutil.rmtree(tmp, ignore_errors=True)
+        return cls(path)
+
+    @staticmethod
+    def _write(file: Path, short_name: str, path: Path, chunk_rows: int, row_group_rows: int):
+        logger.info(f"Ingesting {file} into {path}")
+        spec = fit_feature_spec(pd.read_csv(file, chunksize=chunk_rows), short_name)
+
+        partitions = []
+        start = 0
+        for i, chunk in enumerate(pd.read_csv(file, chunksize=chunk_rows)):
+            chunk.insert(0, ROW_ID, np.arange(start, start + len(chunk), dtype=np.int64))
+            name = f"part-{i:05d}.parquet"
+            chunk.to_parquet(path / name, index=False, row_group_size=row_group_rows)
+            partitions.append({"file": name, "start": start, "rows": len(chunk)})
+            start += len(chunk)
+            logger.debug(f"Partition {name} written ({start} rows so far)")
+
+        # The manifest is written last, its presence marks a complete ingestion
+        manifest = {"source": str(file), "partitions": partitions, "spec": asdict(spec)}
+        (path / MANIFEST).write_text(json.dumps(manifest, indent=2))
+
+    def iter_partitions(self, columns: list[str] | None = None) -> Iterator[pd.DataFrame]:
+        """Yield one partition at a time."""
+        for part in self.partitions:
+            yield pd.read_parquet(self.path / part["file"], columns=columns)
+
+    def rows(self, row_ids: np.ndarray) -> pd.DataFrame:
+        """Load the given rows, only touching the partitions that contain them."""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        frames = []
+        for part in self.partitions:
+            wanted = row_ids[(row_ids >= part["start"]) & (row_ids < part["start"] + part["rows"])]
+            if len(wanted):
+                frames.append(pd.read_parquet(self.path / part["file"], filters=[(ROW_ID, "in", wanted.tolist())]))
+        if not frames:
+            return pd.DataFrame(columns=[ROW_ID])
+        return pd.concat(frames, ignore_index=True)
+
+    def features(self, row_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Encoded X, y and A of the given rows, in the order of `row_ids`."""
+        row_ids = np.asarray(row_ids, dtype=np.int64)
+        if len(row_ids) == 0:
+            return np.empty((0, self.spec.n_features), np.float32), np.empty(0, np.int8), np.empty(0, np.int32)
+        return transform_features(self.rows(row_ids).set_index(ROW_ID).loc[row_ids], self.spec)
+
+    def score_candidates(
+        self,
+        proba: Callable[[np.ndarray], np.ndarray],
+        strategy: ScoreStrategy,
+        k: int,
+        labeled_ids: np.ndarray,
+        labeled_groups: np.ndarray,
+        rng: np.random.Generator,
+    ) -> pd.DataFrame:
+        """
+        Stream over all partitions, score the unlabeled rows with the positive class probabilities
+        from `proba` and keep the `k` best (row id, score) pairs.
+
+        Only the top `k` of the current partition and the running top `k` are held in memory,
+        so the cost is bounded by the partition size regardless of the pool size.
+        """
+        best = pd.DataFrame({ROW_ID: np.empty(0, dtype=np.int64), "score": np.empty(0)})
+        labeled_ids = np.asarray(labeled_ids, dtype=np.int64)
+        for part in self.iter_partitions():
+            part = part[~part[ROW_ID].isin(labeled_ids)]
+            if part.empty:
+                continue
+            X, _, A = transform_features(part, self.spec)
+            row_ids = part[ROW_ID].to_numpy()
+            ctx = QueryContext(proba(X), A, labeled_groups, rng, pool=row_ids, labeled=labeled_ids)
+            scores = strategy(ctx)
+            top = select_batch(scores, k)
+            candidates = pd.DataFrame({ROW_ID: row_ids[top], "score": scores[top]})
+            best = pd.concat([best, candidates], ignore_index=True)
+            best = best.iloc[select_batch(best["score"].to_numpy(), k)].reset_index(drop=True)
+        return best
+
@@ -0,0 +1,109 @@
+import cProfile
+import functools
+import heapq
+import json
+import threading
+import time
+from collections.abc import Callable
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+from fairlabel.config import settings
+from fairlabel.log import logger
+
+
+class Profiler:
+    """
+    On-demand cProfile capture around instrumented operations (see `profiled`).
+
+    While enabled, every instrumented call is profiled and the slowest `keep` captures are kept in
+    `directory` as `<time>-<operation>-<ms>ms.pstats` next to a .json file with the call context
+    (dataset, model, pool size, ...). Analyze offline with `python -m pstats <file>` or snakeviz.
+    Nested instrumented calls are part of the outermost capture. Only one profiler can be active per process,
+    calls in other threads while a capture runs are not captured.
+    """
+
+    _active = threading.Lock()  # held while a cProfile.Profile is enabled, see sys.setprofile
+
+    def __init__(self, directory: Path, keep: int, enabled: bool = False):
+        self.directory = directory
+        self.keep = keep
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._captures: list[tuple[float, str]] = []  # min-heap of (duration, file stem)
+        for file in directory.glob("*.json"):  # captures of earlier runs still count
+            heapq.heappush(self._captures, (json.loads(file.read_text())["seconds"], file.stem))
+
+    @contextmanager
+    def capture(self, operation: str, **context):
+        if not self.enabled or getattr(self._local, "active", False) or not Profiler._active.acquire(blocking=False):
+            yield
+            return
+
+        self._local.active = True
+        profile = cProfile.Profile()
+        start = time.perf_counter()
+        try:
+            profile.enable()
+            yield
+        finally:
+            profile.disable()
+            duration = time.perf_counter() - start
+            self._local.active = False
+            Profiler._active.release()
+            self._store(profile, operation, duration, context)
+
+    def _store(self, profile: cProfile.Profile, operation: str, duration: float, context: dict):
+        with self._lock:
+            if len(self._captures) >= self.keep and duration <= self._captures[0][0]:
+                return  # faster than everything kept
+
+            stem = f"{datetime.now():%Y%m%d-%H%M%S-%f}-{operation}-{duration * 1000:.0f}ms"
+            self.directory.mkdir(parents=True, exist_ok=True)
+            profile.dump_stats(self.directory / f"{stem}.pstats")
+            info = {"operation": operation, "seconds": duration, "thread": threading.current_thread().name, **context}
+            (self.directory / f"{stem}.json").write_text(json.dumps(info, indent=2, default=str))
+
+            heapq.heappush(self._captures, (duration, stem))
+            while len(self._captures) > self.keep:
+                _, evicted = heapq.heappop(self._captures)
+                for suffix in (".pstats", ".json"):
+                    (self.directory / f"{evicted}{suffix}").unlink(missing_ok=True)
+        logger.debug(f"Profile of {operation} captured ({duration * 1000:.0f} ms)")
+
+    def captures(self) -> list[dict]:
+        """Context of the kept captures, slowest first."""
+        with self._lock:
+            stems = [stem for _, stem in sorted(self._captures, reverse=True)]
+        return [
+            {"file": f"{stem}.pstats", **json.loads((self.directory / f"{stem}.json").read_text())} for stem in stems
+        ]
+
+
+profiler = Profiler(
+    directory=settings.profiling.dir,
+    keep=int(settings.profiling.keep),
+    enabled=settings.profiling.enabled,
+)
+
+
+def profiled(operation: str, context: Callable[..., dict] | None = None):
+    """
+    Instrument a function for on-demand profiling. `context` receives the call arguments
+    and returns what should be stored with a capture, e.g. `lambda short_name: {"dataset": short_name}`.
+    Costs a single attribute lookup per call while profiling is disabled.
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return func(*args, **kwargs)
+            with profiler.capture(operation, **(context(*args, **kwargs) if context else {})):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,202 @@
+"""
+Headless active learning simulation.
+
+Sweeps a grid of query strategies, models, batch sizes and seeds with a simulated oracle
+(the true label is revealed as soon as a row is queried) and records learning curves for
+accuracy and fairness. Runs execute in a process pool on memory-mapped feature matrices,
+finished runs are kept per run and dataset version, so an interrupted sweep resumes where it stopped.
+
+    python -m fairlabel.simulation loan_prediction --strategies uncertainty fair_hybrid --seeds 0 1 2
+"""
+
+import argparse
+import hashlib
+import itertools
+import json
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from fairlabel.config import settings
+from fairlabel.data import dataset_version, get_dataset, get_dataset_file, prepare_features
+from fairlabel.index import FeatureIndex
+from fairlabel.log import logger
+from fairlabel.mitigation import WarmFairnessMitigator, demographic_parity_difference
+from fairlabel.models import MODELS
+from fairlabel.strategies import STRATEGIES, QueryContext, positive_proba
+
+
+@dataclass(frozen=True)
+class SimulationRun:
+    strategy: str
+    model: str
+    batch_size: int
+    seed: int
+    rounds: int = 20
+    mitigate: bool = False  # also update a fairness mitigated model after every batch
+
+    @property
+    def run_id(self) -> str:
+        run_id = f"{self.strategy}__{self.model.replace(' ', '_')}__b{self.batch_size}__s{self.seed}__r{self.rounds}"
+        return f"{run_id}__fair" if self.mitigate else run_id
+
+
+def version_dir(short_name: str, out_dir: Path) -> Path:
+    """
+    Directory for the arrays and runs of the current dataset version and configuration,
+    so changing the csv or the dataset settings never reuses stale results.
+    """
+    config = json.dumps(dict(settings.dataset[short_name]), sort_keys=True, default=str)
+    config_hash = hashlib.sha1(config.encode()).hexdigest()[:8]
+    return out_dir / f"{dataset_version(get_dataset_file(short_name))}-{config_hash}"
+
+
+def write_arrays(short_name: str, out_dir: Path) -> Path:
+    """
+    Preprocess the dataset once and store X, y and A as .npy files the workers can memory-map,
+    together with the feature index used by the neighborhood based strategies.
+    """
+    array_dir = version_dir(short_name, out_dir) / "arrays"
+    if not (array_dir / "X.npy").exists():
+        array_dir.mkdir(parents=True, exist_ok=True)
+        X, y, A = prepare_features(get_dataset(short_name), short_name)
+        for name, array in (("y", y), ("A", A), ("X", X)):  # X last, its presence marks completion
+            np.save(array_dir / f"{name}.npy", array)
+    FeatureIndex.load_or_build(array_dir, np.load(array_dir / "X.npy", mmap_mode="r"))
+    return array_dir
+
+
+def simulate(
+    run: SimulationRun,
+    array_dir: Path,
+    seed_size: float = 0.05,
+    test_size: float = 0.3,
+) -> list[dict]:
+    """Execute one active learning run and return its learning curve, one record per round."""
+    X = np.load(array_dir / "X.npy", mmap_mode="r")
+    y = np.load(array_dir / "y.npy", mmap_mode="r")
+    A = np.load(array_dir / "A.npy", mmap_mode="r")
+    index = FeatureIndex.load(array_dir, X)
+
+    rng = np.random.default_rng(run.seed)
+    rows = np.arange(len(y))
+    dev, test = train_test_split(rows, test_size=test_size, random_state=run.seed, stratify=y)
+    labeled, pool = train_test_split(dev, train_size=seed_size, random_state=run.seed, stratify=y[dev])
+    X_test, y_test, A_test = X[test], y[test], A[test]
+
+    model_def = MODELS[run.model]
+    strategy = STRATEGIES[run.strategy]
+    params = {p.name: p.default for p in model_def.hyperparameters}
+    mitigator = WarmFairnessMitigator(model_def.cls(**params)) if run.mitigate else None
+
+    curve = []
+    for i in range(run.rounds + 1):
+        model = model_def.cls(**params)
+        model.fit(X[labeled], y[labeled])
+        y_pred = model.predict(X_test)
+        record = {
+            **asdict(run),
+            "round": i,
+            "n_labeled": len(labeled),
+            "accuracy": float((y_pred == y_test).mean()),
+            "dp_difference": demographic_parity_difference(y_pred, A_test),
+            "max_group_share": float(np.bincount(A[labeled]).max() / len(labeled)),
+        }
+        if mitigator is not None:
+            y_fair = mitigator.update(X[labeled], y[labeled], A[labeled]).predict(X_test)
+            record["fair_accuracy"] = float((y_fair == y_test).mean())
+            record["fair_dp_difference"] = demographic_parity_difference(y_fair, A_test)
+        curve.append(record)
+        if i == run.rounds or len(pool) == 0:
+            break
+
+        # Oracle: the queried rows move to the labeled set with their true label
+        ctx = QueryContext(
+            proba=positive_proba(model, X[pool]),
+            groups=A[pool],
+            labeled_groups=A[labeled],
+            rng=rng,
+            pool=pool,
+            labeled=labeled,
+            index=index,
+        )
+        picked = strategy(ctx, run.batch_size)
+        labeled = np.concatenate([labeled, pool[picked]])
+        pool = np.delete(pool, picked)
+    return curve
+
+
+def run_grid(
+    short_name: str,
+    runs: list[SimulationRun],
+    out_dir: Path,
+    workers: int | None = None,
+) -> pd.DataFrame:
+    """Execute all runs not yet present in `out_dir` in parallel and collect every learning curve."""
+    array_dir = write_arrays(short_name, out_dir)
+    run_dir = array_dir.parent / "runs"
+    run_dir.mkdir(parents=True, exist_ok=True)
+
+    pending = [run for run in runs if not (run_dir / f"{run.run_id}.json").exists()]
+    logger.info(f"Simulation {short_name}: {len(runs) - len(pending)}/{len(runs)} runs already done")
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(simulate, run, array_dir): run for run in pending}
+        for done, future in enumerate(as_completed(futures), start=1):
+            run = futures[future]
+            try:
+                curve = future.result()
+            except Exception:
+                logger.exception(f"Simulation run {run.run_id} failed")
+                continue
+            (run_dir / f"{run.run_id}.json").write_text(json.dumps(curve))
+            logger.info(f"[{done}/{len(pending)}] {run.run_id}: final accuracy {curve[-1]['accuracy']:.3f}")
+
+    records = []
+    for run in runs:
+        file = run_dir / f"{run.run_id}.json"
+        if file.exists():
+            records.extend(json.loads(file.read_text()))
+    return pd.DataFrame.from_records(records)
+
+
+def save_curves(curves: pd.DataFrame, out_dir: Path, fmt: str) -> Path:
+    if fmt == "parquet":
+        file = out_dir / "curves.parquet"
+        curves.to_parquet(file, index=False)
+    else:
+        file = out_dir / "curves.json"
+        curves.to_json(file, orient="records", indent=2)
+    return file
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate active learning strategies with an oracle.")
+    parser.add_argument("dataset", choices=list(settings.dataset.keys()))
+    parser.add_argument("--strategies", nargs="+", default=list(STRATEGIES), choices=list(STRATEGIES))
+    parser.add_argument("--models", nargs="+", default=list(MODELS), choices=list(MODELS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 10])
+    parser.add_argument("--seeds", nargs="+", type=int, default=[0, 1, 2])
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--mitigate", action="store_true", help="also track a warm-started fairness mitigated model")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--format", choices=["json", "parquet"], default="json")
+    parser.add_argument("--out", type=Path, default=None)
+    args = parser.parse_args()
+
+    out_dir = args.out or settings.data.dir / "simulations" / args.dataset
+    runs = [
+        SimulationRun(*combination, rounds=args.rounds, mitigate=args.mitigate)
+        for combination in itertools.product(args.strategies, args.models, args.batch_sizes, args.seeds)
+    ]
+    curves = run_grid(args.dataset, runs, out_dir, args.workers)
+    file = save_curves(curves, version_dir(args.dataset, out_dir), args.format)
+    logger.info(f"Learning curves written to {file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import numpy as np
+from sklearn.metrics import pairwise_distances_argmin_min
+
+from fairlabel.index import FeatureIndex
+from fairlabel.profiling import profiled
+
+FAIRNESS_BOOST = 1.5
+CANDIDATE_FACTOR = 10  # batch strategies only look at the `CANDIDATE_FACTOR * batch_size` most uncertain rows
+
+
+@dataclass
+class QueryContext:
+    """
+    Everything a query strategy may look at for one query:
+    - proba: positive class probability per pool row
+    - groups / labeled_groups: sensitive group codes of pool and labeled rows
+    - pool / labeled: row positions in the full feature matrix, needed by strategies using the index
+    """
+
+    proba: np.ndarray
+    groups: np.ndarray
+    labeled_groups: np.ndarray
+    rng: np.random.Generator
+    pool: np.ndarray | None = None
+    labeled: np.ndarray | None = None
+    index: FeatureIndex | None = None
+
+    def require_index(self) -> FeatureIndex:
+        if self.index is None or self.pool is None:
+            raise ValueError("This query strategy needs a feature index and pool row positions")
+        return self.index
+
+
+# Score strategies rate every pool row on its own (higher is queried first), so they can also be
+# evaluated partition by partition. Batch strategies pick a whole batch at once and return pool positions.
+ScoreStrategy = Callable[[QueryContext], np.ndarray]
+BatchStrategy = Callable[[QueryContext, int], np.ndarray]
+
+SCORES: dict[str, ScoreStrategy] = {}
+STRATEGIES: dict[str, BatchStrategy] = {}
+NEEDS_INDEX: set[str] = set()  # strategies that look at the feature index, see `QueryContext.require_index`
+
+
+def register_score(name: str, needs_index: bool = False) -> Callable[[ScoreStrategy], ScoreStrategy]:
+    """Register a score strategy, it is also available as batch strategy taking the top scores."""
+
+    def decorator(score: ScoreStrategy) -> ScoreStrategy:
+        SCORES[name] = score
+        STRATEGIES[name] = lambda ctx, batch_size: select_batch(score(ctx), batch_size)
+        if needs_index:
+            NEEDS_INDEX.add(name)
+        return score
+
+    return decorator
+
+
+def register_batch(name: str, needs_index: bool = False) -> Callable[[BatchStrategy], BatchStrategy]:
+    """Register a batch strategy."""
+
+    def decorator(strategy: BatchStrategy) -> BatchStrategy:
+        STRATEGIES[name] = strategy
+        if needs_index:
+            NEEDS_INDEX.add(name)
+        return strategy
+
+    return decorator
+
+
+def positive_proba(model, X: np.ndarray) -> np.ndarray:
+    """Probability of the positive class, uninformative (0.5) without a model, constant for a single class."""
+    if model is None:
+        return np.full(len(X), 0.5)
+    if len(model.classes_) < 2:
+        return np.full(len(X), float(model.classes_[0]))
+    return model.predict_proba(X)[:, 1]
+
+
+def select_batch(scores: np.ndarray, batch_size: int) -> np.ndarray:
+    """Positions of the `batch_size` highest scores, best first."""
+    batch_size = min(batch_size, len(scores))
+    if batch_size <= 0:
+        return np.empty(0, dtype=np.intp)
+    top = np.argpartition(-scores, batch_size - 1)[:batch_size]
+    return top[np.argsort(-scores[top])]
+
+
+# --- Score strategies ---
+@register_score("uncertainty")
+def uncertainty_sampling(ctx: QueryContext) -> np.ndarray:
+    """Uncertainty is 1 minus the absolute distance from 0.5 (closer to 0.5 is higher uncertainty)."""
+    return 1 - np.abs(ctx.proba - 0.5)
+
+
+@register_score("random")
+def random_sampling(ctx: QueryContext) -> np.ndarray:
+    """Baseline without any model information."""
+    return ctx.rng.random(len(ctx.proba))
+
+
+@register_score("fair_hybrid")
+@profiled("fair_hybrid_sampling", lambda ctx: {"pool_size": len(ctx.proba)})
+def fair_hybrid_sampling(ctx: QueryContext) -> np.ndarray:
+    """
+    Hybrid Uncertainty + Fairness score (see `fair_active_select` in web/test.py):
+    - Every group should make up an equal share of the labeled items
+    - Items of underrepresented groups get a boost scaled by the deviation from that share
+    """
+    groups, labeled_groups = ctx.groups, ctx.labeled_groups
+    n_groups = max(int(groups.max(initial=0)), int(labeled_groups.max(initial=0))) + 1
+    target = 1 / n_groups
+    if len(labeled_groups) == 0:
+        share = np.full(n_groups, target)
+    else:
+        share = np.bincount(labeled_groups, minlength=n_groups) / len(labeled_groups)
+    boost = FAIRNESS_BOOST * np.clip(target - share, 0, None)
+    return uncertainty_sampling(ctx) + boost[groups]
+
+
+@register_score("density", needs_index=True)
+def density_weighted_sampling(ctx: QueryContext) -> np.ndarray:
+    """Uncertainty weighted by the precomputed density, prefers uncertain rows from dense regions over outliers."""
+    index = ctx.require_index()
+    return uncertainty_sampling(ctx) * index.density[ctx.pool]
+
+
+# --- Batch strategies ---
+def _candidates(ctx: QueryContext, batch_size: int) -> np.ndarray:
+    return select_batch(uncertainty_sampling(ctx), CANDIDATE_FACTOR * batch_size)
+
+
+@register_batch("cluster_diverse", needs_index=True)
+def cluster_diverse_sampling(ctx: QueryContext, batch_size: int) -> np.ndarray:
+    """Most uncertain rows, taking turns between the precomputed clusters so a batch does not repeat itself."""
+    index = ctx.require_index()
+    candidates = _candidates(ctx, batch_size)
+    clusters = index.clusters[ctx.pool[candidates]]
+
+    # Rank of each candidate within its cluster (candidates are sorted by uncertainty already)
+    order = np.argsort(clusters, kind="stable")
+    starts = np.r_[0, np.flatnonzero(np.diff(clusters[order])) + 1]
+    rank = np.empty(len(candidates), dtype=np.intp)
+    rank[order] = np.arange(len(candidates)) - np.repeat(starts, np.diff(np.r_[starts, len(candidates)]))
+    return candidates[np.argsort(rank, kind="stable")[:batch_size]]
+
+
+@register_batch("core_set", needs_index=True)
+def core_set_sampling(ctx: QueryContext, batch_size: int) -> np.ndarray:
+    """
+    Greedy k-center among the most uncertain rows: every pick is the candidate farthest
+    from everything labeled or picked so far. Distances are only computed for the candidates.
+    """
+    index = ctx.require_index()
+    candidates = _candidates(ctx, batch_size)
+    X = index.features[ctx.pool[candidates]]
+    if ctx.labeled is not None and len(ctx.labeled):
+        _, min_dist = pairwise_distances_argmin_min(X, index.features[ctx.labeled])
+    else:
+        min_dist = np.full(len(candidates), np.inf)
+
+    picked = []
+    for _ in range(min(batch_size, len(candidates))):
+        best = int(np.argmax(min_dist))
+        picked.append(best)
+        min_dist = np.minimum(min_dist, np.linalg.norm(X - X[best], axis=1))
+        min_dist[picked] = -1
+    return candidates[picked]
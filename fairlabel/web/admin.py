@@ -0,0 +1,32 @@
+from fastapi import Header
+from nicegui import app
+from pydantic import BaseModel
+
+from fairlabel.config import settings
+from fairlabel.log import logger
+from fairlabel.profiling import profiler
+from fairlabel.web.auth import require_token
+
+
+class ProfilingSwitch(BaseModel):
+    enabled: bool
+
+
+def check_token(token: str | None):
+    require_token(token, settings.profiling.admin_token, "admin")
+
+
+@app.get("/api/admin/profiling")
+def profiling_status(x_admin_token: str | None = Header(default=None)):
+    """Whether profiling is on and the kept captures, slowest first."""
+    check_token(x_admin_token)
+    return {"enabled": profiler.enabled, "directory": str(profiler.directory), "captures": profiler.captures()}
+
+
+@app.post("/api/admin/profiling")
+def switch_profiling(switch: ProfilingSwitch, x_admin_token: str | None = Header(default=None)):
+    """Turn profiling on or off at runtime, e.g. curl -X POST -d '{"enabled": true}' <host>/api/admin/profiling"""
+    check_token(x_admin_token)
+    profiler.enabled = switch.enabled
+    logger.info(f"Profiling {'enabled' if switch.enabled else 'disabled'}")
+    return {"enabled": profiler.enabled}
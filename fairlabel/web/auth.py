@@ -0,0 +1,14 @@
+import secrets
+
+from fastapi import HTTPException
+
+
+def require_token(token: str | None, expected: str, api: str):
+    """
+    Check the token a request came with against the configured one.
+    While no token is configured the API is disabled, so nothing is exposed by default.
+    """
+    if not expected:
+        raise HTTPException(status_code=403, detail=f"The {api} API is disabled, configure a token to enable it")
+    if token is None or not secrets.compare_digest(token.encode(), expected.encode()):
+        raise HTTPException(status_code=403, detail="Invalid token")
@@ -1,5 +1,11 @@
+from dataclasses import dataclass, field
+from typing import Any
+
 from nicegui import app
 
+from fairlabel.log import logger
+from fairlabel.web.sessions import sessions
+
 
 def element_group(elem, obj):
     elem.bind_value(obj, "value")
@@ -7,17 +13,45 @@ def element_group(elem, obj):
     return elem
 
 
+@dataclass
+class ProxyState:
+    """Surrogate used for candidate scoring while the selected model only retrains periodically."""
+
+    model: Any = None
+    calibration: Any = None  # maps surrogate onto selected model probabilities
+    full_retrain_labels: int = 0  # number of labels at the last full retrain
+    agreement: dict = field(default_factory=dict)  # surrogate vs. selected model ranking at that retrain
+
+
+@dataclass
+class MitigationState:
+    """Fairness mitigated copy of the selected model, updated with every retrain of it."""
+
+    model: Any = None  # WarmFairnessMitigator
+    report: dict = field(default_factory=dict)  # accuracy and demographic parity difference on the labeled rows
+
+
 class Client:
+    # Attributes the session manager may spill to disk while the client is idle
+    HEAVY_STATE = ("_model_instance", "_labels", "_proxy", "_mitigation")
+
     def __init__(self, id: str):
         self._id: str = id  # corresponds to ui.context.client.id
         self._dataset = None
+        self.state_version = 0  # bumped on every change of the heavy state
 
     def reset(self):
         """Clears all client state."""
+        sessions.forget(self._id)  # spilled state must not come back
         self._dataset = None
         self._model_name = None
         self._model_params = {}
         self._model_instance = None
+        self._labels = None
+        self._candidates = []
+        self._proxy = None
+        self._mitigation = None
+        self.state_version += 1
 
     @staticmethod
     def retrieve() -> "Client":
@@ -26,7 +60,13 @@ class Client:
 
         This is also the definition of a client (app.storage.tab)
         """
-        return app.storage.tab["client"]
+        client = app.storage.tab["client"]
+        sessions.touch(client)
+        return client
+
+    @property
+    def id(self) -> str:
+        return self._id
 
     @property
     def dataset(self):
@@ -34,7 +74,7 @@ class Client:
 
     @dataset.setter
     def dataset(self, value):
-        print(f"dataset selected: {value}")
+        logger.debug(f"Client-{self._id[-4:]} selected dataset: {value}")
         self._dataset = value
 
     @property
@@ -53,10 +93,68 @@ class Client:
     def model_params(self, value):
         self._model_params = value
 
+    # Heavy state may have been spilled to disk, it is brought back before every access
     @property
     def model_instance(self):
+        sessions.ensure_resident(self)
         return getattr(self, "_model_instance", None)
 
     @model_instance.setter
     def model_instance(self, value):
+        sessions.ensure_resident(self)
         self._model_instance = value
+        self.state_version += 1
+
+    @property
+    def labels(self) -> dict:
+        """Label overlay of the selected dataset: row id -> label."""
+        sessions.ensure_resident(self)
+        if getattr(self, "_labels", None) is None:
+            self._labels = {}
+        return self._labels
+
+    @labels.setter
+    def labels(self, value: dict):
+        sessions.ensure_resident(self)
+        self._labels = value
+        self.state_version += 1
+
+    @property
+    def candidates(self) -> list[int]:
+        """Row ids to label next, best first."""
+        return getattr(self, "_candidates", [])
+
+    @candidates.setter
+    def candidates(self, value: list[int]):
+        self._candidates = value
+
+    @property
+    def proxy(self) -> ProxyState:
+        sessions.ensure_resident(self)
+        if getattr(self, "_proxy", None) is None:
+            self._proxy = ProxyState()
+        return self._proxy
+
+    @proxy.setter
+    def proxy(self, value: ProxyState):
+        sessions.ensure_resident(self)
+        self._proxy = value
+        self.state_version += 1
+
+    @property
+    def mitigation(self) -> MitigationState:
+        sessions.ensure_resident(self)
+        if getattr(self, "_mitigation", None) is None:
+            self._mitigation = MitigationState()
+        return self._mitigation
+
+    @mitigation.setter
+    def mitigation(self, value: MitigationState):
+        sessions.ensure_resident(self)
+        self._mitigation = value
+        self.state_version += 1
+
+    def update_labels(self, labels: dict):
+        """Adds or overwrites labels in the overlay."""
+        self.labels.update(labels)
+        self.state_version += 1
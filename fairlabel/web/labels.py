@@ -0,0 +1,172 @@
+from dataclasses import replace
+from pathlib import Path
+
+from fastapi import Header, HTTPException, Request
+from nicegui import app, background_tasks, ui
+
+from fairlabel.config import settings
+from fairlabel.formats import LABEL_FORMATS
+from fairlabel.log import logger
+from fairlabel.web import lazy
+from fairlabel.web.auth import require_token
+from fairlabel.web.client import Client, MitigationState
+from fairlabel.web.sessions import sessions
+
+# fairlabel.labeling (pandas, scipy, sklearn) is only imported in the worker threads, see `lazy.io_bound`
+_retraining: set[str] = set()
+_retrain_requested: set[str] = set()
+_full_retraining: set[str] = set()
+
+
+async def retrain(client: Client):
+    """
+    Retrain the client model on all labels and rescore the pool.
+    Requests arriving while a retrain runs are coalesced into a single follow-up retrain.
+    In proxy mode only the surrogate is refit here, the selected model follows in the background.
+    The fairness mitigated model (`mitigation.enabled`) is updated whenever the selected model is.
+    """
+    _retrain_requested.add(client.id)
+    if client.id in _retraining:
+        return
+
+    _retraining.add(client.id)
+    try:
+        with sessions.in_use(client):  # not spilled while the retrain is in flight
+            while client.id in _retrain_requested:
+                _retrain_requested.discard(client.id)
+                if client.model_instance is None or not client.dataset:
+                    return
+                if settings.proxy.enabled:
+                    await retrain_proxy(client)
+                    continue
+                labels = dict(client.labels)
+                model, candidates = await lazy.io_bound(
+                    "fairlabel.labeling:train_and_score",
+                    client.dataset,
+                    client.model_instance,
+                    labels,
+                    strategy=settings.labeling.strategy,
+                )
+                if model is not None:
+                    client.model_instance = model
+                client.candidates = candidates
+                if settings.mitigation.enabled:
+                    await update_fair_model(client, labels)
+                logger.info(f"Client-{client.id[-4:]} retrained on {len(labels)} labels", extra={"every": 5.0})
+    finally:
+        _retraining.discard(client.id)
+
+
+async def retrain_proxy(client: Client):
+    """Refit the surrogate for the next candidates and start a full retrain every `proxy.full_every` labels."""
+    labels = dict(client.labels)
+    proxy, candidates = await lazy.io_bound(
+        "fairlabel.labeling:train_proxy_and_score",
+        client.dataset,
+        labels,
+        settings.proxy.model,
+        client.proxy.calibration,
+        strategy=settings.labeling.strategy,
+    )
+    client.proxy = replace(client.proxy, model=proxy)
+    client.candidates = candidates
+    logger.info(f"Client-{client.id[-4:]} surrogate refit on {len(labels)} labels", extra={"every": 5.0})
+
+    due = len(labels) - client.proxy.full_retrain_labels >= int(settings.proxy.full_every)
+    if due and client.id not in _full_retraining:
+        background_tasks.create(retrain_full(client), name=f"retrain-full-{client.id}")
+
+
+async def retrain_full(client: Client):
+    """Retrain the selected model, then recalibrate the surrogate onto it and record their ranking agreement."""
+    _full_retraining.add(client.id)
+    try:
+        with sessions.in_use(client):
+            labels = dict(client.labels)
+            # Only the surrogate ranks the pool in proxy mode, so the selected model is fit without scoring it
+            model = await lazy.io_bound("fairlabel.labeling:train_model", client.dataset, client.model_instance, labels)
+            if model is None:
+                return
+            client.model_instance = model
+            if settings.mitigation.enabled:
+                await update_fair_model(client, labels)
+
+            surrogate = client.proxy.model
+            if surrogate is None:
+                client.proxy = replace(client.proxy, full_retrain_labels=len(labels))
+                return
+            calibration, agreement = await lazy.io_bound(
+                "fairlabel.labeling:calibrate_proxy",
+                client.dataset,
+                surrogate,
+                model,
+                labels,
+                int(settings.proxy.sample),
+            )
+            # The surrogate may have been refit meanwhile, only update what this retrain computed
+            client.proxy = replace(
+                client.proxy, calibration=calibration, agreement=agreement, full_retrain_labels=len(labels)
+            )
+            logger.info(f"Client-{client.id[-4:]} surrogate agreement: {agreement}")
+    finally:
+        _full_retraining.discard(client.id)
+
+
+async def update_fair_model(client: Client, labels: dict[int, int]):
+    """Continue the warm-started fairness mitigation of the selected model on the given labels."""
+    mitigator, report = await lazy.io_bound(
+        "fairlabel.labeling:update_mitigator", client.dataset, client.mitigation.model, client.model_instance, labels
+    )
+    client.mitigation = MitigationState(model=mitigator, report=report or client.mitigation.report)
+    if report:
+        logger.info(f"Client-{client.id[-4:]} fair model updated: {report}", extra={"every": 5.0})
+
+
+async def import_labels(client: Client, data: bytes, fmt: str) -> int:
+    """
+    Parse and validate a label batch off the event loop, apply it in one step and schedule one retrain.
+    Raises a ValueError if the batch is invalid, in which case no label is applied.
+    """
+    dataset = client.dataset
+    if not dataset:
+        raise ValueError("No dataset selected")
+    with sessions.in_use(client):  # not spilled between validation and applying the batch
+        labels = await lazy.io_bound("fairlabel.labeling:read_labels", data, fmt, dataset)
+        if client.dataset != dataset:
+            raise ValueError("The dataset was changed during the import")
+        client.update_labels(labels)
+    background_tasks.create(retrain(client), name=f"retrain-{client.id}")
+    return len(labels)
+
+
+async def upload_labels(e):
+    """Upload handler for label files (csv, json lines or arrow)."""
+    client = Client.retrieve()
+    fmt = LABEL_FORMATS.get(Path(e.file.name).suffix.lower(), "")
+    try:
+        applied = await import_labels(client, await e.file.read(), fmt)
+    except (ValueError, ImportError) as err:
+        ui.notify(f"Label import failed: {err}", type="negative")
+        return
+    ui.notify(f"{applied} labels imported, retraining model", type="positive")
+
+
+@app.post("/api/clients/{client_id}/labels")
+async def post_labels(client_id: str, request: Request, x_api_token: str | None = Header(default=None)):
+    """
+    Bulk label import (requires `api.token`), e.g.
+    curl -X POST -H "X-Api-Token: <token>" -H "Content-Type: text/csv" --data-binary @labels.csv \
+        <host>/api/clients/<client id>/labels
+    """
+    require_token(x_api_token, settings.api.token, "label import")
+    client = sessions.get(client_id)
+    if client is None:
+        raise HTTPException(status_code=404, detail=f"Unknown client {client_id}")
+    fmt = LABEL_FORMATS.get(request.headers.get("content-type", "").split(";")[0].strip())
+    if fmt is None:
+        raise HTTPException(status_code=415, detail=f"Unsupported content type, use one of {list(LABEL_FORMATS)[:5]}")
+    try:
+        applied = await import_labels(client, await request.body(), fmt)
+    except (ValueError, ImportError) as err:
+        raise HTTPException(status_code=422, detail=str(err)) from err
+    return {"applied": applied, "labeled": len(client.labels)}
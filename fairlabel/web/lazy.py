@@ -0,0 +1,16 @@
+import importlib
+
+from nicegui import run
+
+
+def _call(target: str, *args, **kwargs):
+    module, name = target.split(":")
+    return getattr(importlib.import_module(module), name)(*args, **kwargs)
+
+
+async def io_bound(target: str, *args, **kwargs):
+    """
+    `run.io_bound` for a "module:function" target that is imported in the worker thread,
+    so a heavy import (or waiting for `preload` to finish it) never blocks the event loop.
+    """
+    return await run.io_bound(_call, target, *args, **kwargs)
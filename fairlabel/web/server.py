@@ -1,12 +1,19 @@
+import asyncio
+import importlib
+
 from nicegui import app, background_tasks, run, ui
 
 from fairlabel.config import FAVICON, PACKAGE_ROOT, settings
-from fairlabel.data import cache_data
 from fairlabel.log import logger
+from fairlabel.web import admin  # noqa: F401 (registers the admin routes)
 from fairlabel.web.client import Client
+from fairlabel.web.sessions import sessions
 from fairlabel.web.widgets import Menu
 from fairlabel.web.wizard import SetupWizard
 
+# Heavy modules (pandas, scipy, sklearn) are not imported by the web modules, see `preload`
+PRELOAD_MODULES = ("fairlabel.data", "fairlabel.dataset_profile", "fairlabel.labeling")
+
 
 async def setup_ui():
     client_tab_id = "Unknown"
@@ -20,6 +27,37 @@ async def setup_ui():
         logger.warning(f"Connection timeout for client {client_tab_id[-4:]}. Please reload the page.")
 
 
+async def sweep_sessions():
+    """Periodically spill idle or least recently used client state to disk (on the event loop, see SessionManager)."""
+    while True:
+        await asyncio.sleep(settings.sessions.sweep_s)
+        sessions.sweep()
+
+
+def preload():
+    """Import the heavy modules once the server is up, off the event loop, before the first page needs them."""
+    for module in PRELOAD_MODULES:
+        importlib.import_module(module)
+    logger.debug(f"Preloaded {', '.join(PRELOAD_MODULES)}")
+
+
+def cache_datasets():
+    """Download the configured datasets that are not cached yet, off the event loop while the server already serves."""
+    from fairlabel.data import cache_data
+
+    for data_set in settings.dataset.values():
+        try:
+            cache_data(data_set.name)
+        except Exception as e:  # e.g. offline, the datasets cached before stay usable
+            logger.warning(f"Could not download {data_set.name}: {e}")
+
+
+app.on_startup(lambda: background_tasks.create(sweep_sessions(), name="sweep_sessions"))
+app.on_startup(lambda: background_tasks.create(run.io_bound(preload), name="preload"))
+if settings.data.download_on_start:
+    app.on_startup(lambda: background_tasks.create(run.io_bound(cache_datasets), name="cache_datasets"))
+
+
 @ui.page("/")
 async def main():
     await setup_ui()
@@ -47,7 +85,5 @@ async def main():
 
 
 if __name__ in {"__main__", "__mp_main__"}:
-    for data_set in settings.dataset.values():
-        cache_data(data_set.name)
     app.add_static_files("/static", PACKAGE_ROOT / "web/static")
     ui.run(title="fairlabel", favicon=FAVICON)
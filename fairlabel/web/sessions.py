@@ -0,0 +1,196 @@
+import itertools
+import pickle
+import sys
+import threading
+import time
+import weakref
+from collections import Counter, OrderedDict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+
+from fairlabel.config import settings
+from fairlabel.log import logger
+
+SCALARS = (int, float, bool, str, bytes)
+TREE_NODE_BYTES = 64  # one node of a fitted sklearn tree (children, feature, threshold, impurity, counts)
+
+
+def estimate_bytes(value, depth: int = 8) -> int:
+    """
+    Rough memory footprint of heavy client state without serializing it: array buffers (`nbytes`),
+    fitted sklearn trees from their node count, containers and object attributes recursively.
+    Only used to rank clients against the memory ceiling, so it favors speed over precision.
+    """
+    if isinstance(value, SCALARS) or value is None or depth == 0:
+        return sys.getsizeof(value)
+    if isinstance(nbytes := getattr(value, "nbytes", None), int):  # numpy arrays
+        return nbytes
+    if hasattr(value, "node_count") and hasattr(value, "max_n_classes"):  # sklearn.tree._tree.Tree
+        return value.node_count * (TREE_NODE_BYTES + 8 * value.n_outputs * value.max_n_classes)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        keys = _items_bytes(iter(value), len(value), depth)
+        return size + keys + _items_bytes(iter(value.values()), len(value), depth)
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return size + _items_bytes(iter(value), len(value), depth)
+    if hasattr(value, "__dict__"):
+        return size + _items_bytes(iter(vars(value).values()), len(vars(value)), depth)
+    return size
+
+
+def _items_bytes(items: Iterator, count: int, depth: int) -> int:
+    sample = list(itertools.islice(items, 64))
+    if all(isinstance(item, SCALARS) for item in sample):  # e.g. a label overlay, extrapolated from the sample
+        return sum(map(sys.getsizeof, sample)) * count // max(len(sample), 1)
+    return sum(estimate_bytes(item, depth - 1) for item in itertools.chain(sample, items))
+
+
+class SessionManager:
+    """
+    Keeps the heavy per-tab client state (fitted models, label overlays) within limits:
+    - Clients idle for longer than `ttl` seconds get their heavy state spilled to disk
+    - If the resident heavy state exceeds `max_bytes`, the least recently used clients are spilled first
+    - A spilled client is rehydrated the next time it is touched (see `Client.retrieve`)
+      or one of its heavy attributes is accessed (see `ensure_resident`)
+    - Clients with work in flight (see `in_use`) are never spilled
+
+    Clients are only referenced weakly, they live as long as their tab storage does.
+    A client exposes the names of its heavy attributes as `HEAVY_STATE` and bumps
+    `state_version` whenever one of them changes, so sizes are only re-estimated after changes
+    (see `estimate_bytes`, nothing is serialized until a client is actually spilled).
+    Client state is only changed on the event loop, so `sweep` has to run there as well.
+    """
+
+    def __init__(self, spill_dir: Path, ttl: float, max_bytes: int):
+        self.spill_dir = spill_dir
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.RLock()
+        self._clients: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+        self._last_access: OrderedDict[str, float] = OrderedDict()  # least recently used first
+        self._sizes: dict[str, tuple[int, int]] = {}  # client id -> (state version, estimated bytes)
+        self._spilled: set[str] = set()
+        self._in_use: Counter[str] = Counter()  # client id -> number of operations in flight
+
+    def spill_file(self, client_id: str) -> Path:
+        return self.spill_dir / f"{client_id}.pkl"
+
+    def touch(self, client) -> None:
+        """Mark the client as used right now and bring its heavy state back if it was spilled."""
+        with self._lock:
+            self._clients[client.id] = client
+            self._last_access[client.id] = time.monotonic()
+            self._last_access.move_to_end(client.id)
+            if client.id in self._spilled:
+                self._rehydrate(client)
+
+    def ensure_resident(self, client) -> None:
+        """Bring spilled heavy state back before it is read or written."""
+        with self._lock:
+            if client.id in self._spilled:
+                self._rehydrate(client)
+
+    @contextmanager
+    def in_use(self, client):
+        """Keep the client's heavy state in memory while an operation on it is in flight, e.g. across awaits."""
+        with self._lock:
+            self.touch(client)
+            self._in_use[client.id] += 1
+        try:
+            yield client
+        finally:
+            with self._lock:
+                self._in_use[client.id] -= 1
+                if self._in_use[client.id] <= 0:
+                    del self._in_use[client.id]
+                self.touch(client)
+
+    def get(self, client_id: str):
+        """Client by id (None if unknown), touched like in `Client.retrieve`."""
+        with self._lock:
+            client = self._clients.get(client_id)
+            if client is not None:
+                self.touch(client)
+            return client
+
+    def forget(self, client_id: str) -> None:
+        with self._lock:
+            self._last_access.pop(client_id, None)
+            self._sizes.pop(client_id, None)
+            self._spilled.discard(client_id)
+            self.spill_file(client_id).unlink(missing_ok=True)
+
+    def resident_bytes(self) -> int:
+        with self._lock:
+            return sum(self._size(client) for client in self._resident())
+
+    def sweep(self) -> None:
+        """Spill expired clients, then the least recently used ones until the memory ceiling holds."""
+        with self._lock:
+            for client_id in [cid for cid in self._last_access if cid not in self._clients]:
+                self.forget(client_id)  # tab storage is gone
+
+            now = time.monotonic()
+            for client in self._resident():
+                if now - self._last_access[client.id] > self.ttl and client.id not in self._in_use:
+                    self._spill(client, reason="idle")
+
+            resident = self._resident()
+            total = sum(self._size(client) for client in resident)
+            for client in resident:  # least recently used first
+                if total <= self.max_bytes:
+                    break
+                if client.id in self._in_use:
+                    continue
+                total -= self._size(client)
+                self._spill(client, reason="memory ceiling")
+
+    def _resident(self) -> list:
+        """Clients with heavy state in memory, least recently used first."""
+        clients = (self._clients.get(client_id) for client_id in self._last_access if client_id not in self._spilled)
+        return [client for client in clients if client is not None and self._heavy_state(client)]
+
+    def _heavy_state(self, client) -> dict:
+        state = {name: getattr(client, name, None) for name in client.HEAVY_STATE}
+        return {name: value for name, value in state.items() if value is not None}
+
+    def _size(self, client) -> int:
+        version, size = self._sizes.get(client.id, (None, 0))
+        if version != client.state_version:
+            size = estimate_bytes(self._heavy_state(client))
+            self._sizes[client.id] = (client.state_version, size)
+        return size
+
+    def _spill(self, client, reason: str) -> None:
+        state = self._heavy_state(client)
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_file(client.id), "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+        for name in state:
+            setattr(client, name, None)
+        self._spilled.add(client.id)
+        # A sweep may spill many clients at once
+        logger.info(f"Client-{client.id[-4:]} heavy state spilled to disk ({reason})", extra={"every": 1.0})
+
+    def _rehydrate(self, client) -> None:
+        file = self.spill_file(client.id)
+        with open(file, "rb") as f:
+            state = pickle.load(f)
+        for name, value in state.items():
+            # Values set while spilled are newer than the spilled ones, dicts (label overlays) are merged
+            current = getattr(client, name, None)
+            if current is None:
+                setattr(client, name, value)
+            elif isinstance(current, dict) and isinstance(value, dict):
+                setattr(client, name, {**value, **current})
+        file.unlink(missing_ok=True)
+        self._spilled.discard(client.id)
+        logger.info(f"Client-{client.id[-4:]} heavy state restored from disk", extra={"every": 1.0})
+
+
+sessions = SessionManager(
+    spill_dir=settings.sessions.dir,
+    ttl=settings.sessions.ttl_s,
+    max_bytes=1024 * 1024 * int(settings.sessions.max_memory_mb),
+)
@@ -5,6 +5,8 @@ from sklearn.linear_model import LogisticRegression
 from sklearn.preprocessing import StandardScaler
 import random
 
+from fairlabel.profiling import profiled
+
 # --- 1. DATA AND STATE MANAGEMENT ---
 
 # Mock Credit Approval Dataset (Tabular)
@@ -38,6 +40,7 @@ state = AppState()
 # --- 2. MACHINE LEARNING AND FAIRNESS LOGIC ---
 
 
+@profiled("train_model", lambda: {"n_labeled": int(state.df["Label"].count())})
 def train_model():
     """Trains the Logistic Regression model using labeled data."""
     labeled_df = state.df.dropna(subset=["Label"])
@@ -74,6 +77,7 @@ def calculate_uncertainty_score(features_df):
     return pd.Series(uncertainty, index=features_df.index)
 
 
+@profiled("fair_active_select", lambda: {"pool_size": int(state.df["Label"].isna().sum())})
 def fair_active_select():
     """Selects the next item using a hybrid Uncertainty + Fairness score."""
     unlabeled_df = state.df[state.df["Label"].isna()]
@@ -1,8 +1,11 @@
-from nicegui import background_tasks, run, ui
+from nicegui import background_tasks, ui
 
 from fairlabel.config import settings
-from fairlabel.data import clean_column_name, get_dataset, infer_column_types
+from fairlabel.formats import LABEL_FORMATS
+from fairlabel.log import logger
+from fairlabel.web import lazy
 from fairlabel.web.client import Client
+from fairlabel.web.labels import upload_labels
 
 
 
@@ -20,7 +23,10 @@ class Menu(ui.left_drawer):
     def __init__(self) -> None:
         super().__init__(fixed=True, bordered=False)
         self.app_client = Client.retrieve()
-        
+        self.profile: dict | None = None
+        self.profile_error: str | None = None
+        self.loading_profile = False
+
         ui.colors(**settings.colors)
 
         with Header():
@@ -34,7 +40,7 @@ class Menu(ui.left_drawer):
             self.update_info()
 
     def update_info(self):
-        """Refresh dataset overview based on client selection."""
+        """Refresh dataset overview based on client selection, the dataset profile is loaded in the background."""
         self.info_container.clear()
         
         dataset_name = self.app_client.dataset
@@ -44,18 +50,60 @@ class Menu(ui.left_drawer):
                 ui.label("No dataset selected")
                 return
             
-            df = get_dataset(dataset_name)
-
             data_cfg = settings.dataset[dataset_name]
             ui.label(f"📊 {dataset_name}").classes("text-lg font-semibold")
             ui.label(f"Name: {data_cfg.get('name', '-')}")
             ui.label(f"Label: {data_cfg.get('label', '-')}")
             ui.label(f"Excluded: {', '.join(data_cfg.get('exclude', [])) or '-'}")
-            ui.label("Columns:").classes("mt-2 font-medium")
+            if settings.mitigation.enabled and (report := self.app_client.mitigation.report):
+                ui.label(
+                    f"Fair model: {report['accuracy']:.0%} accuracy, {report['dp_difference']:.2f} parity gap "
+                    f"on {report['n_labeled']} labels"
+                ).classes("text-xs text-gray-500")
+            if settings.proxy.enabled and (agreement := self.app_client.proxy.agreement):
+                ui.label(
+                    f"Surrogate agreement: {agreement['spearman']:.2f} spearman, "
+                    f"{agreement['top_k_overlap']:.0%} top candidates (at {agreement['n_labeled']} labels)"
+                ).classes("text-xs text-gray-500")
+            self.render_profile(dataset_name)
+
+            ui.label("Import Labels:").classes("mt-2 font-medium")
+            ui.upload(on_upload=upload_labels, auto_upload=True).props(
+                f"flat accept={','.join(ext for ext in LABEL_FORMATS if ext.startswith('.'))}"
+            ).tooltip("csv, json lines or arrow file with the columns row_id and label")
+            if settings.api.token:
+                ui.label(f"API: POST /api/clients/{self.app_client.id}/labels").classes("text-xs text-gray-500")
 
-            with ui.column().classes("ml-2"):
-                for col, dtype in infer_column_types(df).items():
-                    ui.label(f"- {clean_column_name(col)}: {dtype}")
+    def render_profile(self, dataset_name: str):
+        if self.profile_error:
+            ui.label(f"Dataset profile failed: {self.profile_error}").classes("text-sm text-negative")
+            return
+        if self.profile is None:
+            with ui.row().classes("items-center gap-2"):
+                ui.spinner()
+                ui.label("Profiling dataset...").classes("text-sm text-gray-600")
+            if not self.loading_profile:
+                self.loading_profile = True
+                background_tasks.create(self.load_profile(dataset_name), name=f"profile-{dataset_name}")
+            return
+
+        ui.label(f"Rows: {self.profile['rows']}")
+        ui.label("Columns:").classes("mt-2 font-medium")
+        with ui.column().classes("ml-2"):
+            for info in self.profile["columns"].values():
+                ui.label(f"- {info['name']}: {info['type']}")
+
+    async def load_profile(self, dataset_name: str):
+        """Read (or compute once) the dataset profile off the event loop, then render the overview again."""
+        try:
+            self.profile = await lazy.io_bound("fairlabel.dataset_profile:get_dataset_profile", dataset_name)
+        except Exception as err:
+            logger.exception(f"Loading the profile of {dataset_name} failed")
+            self.profile_error = str(err) or type(err).__name__
+        finally:
+            self.loading_profile = False
+        if self.app_client.dataset == dataset_name:
+            self.update_info()
 
     def restart(self):
         """Resets client state and reloads to show wizard."""
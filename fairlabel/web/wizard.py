@@ -1,49 +1,68 @@
-from typing import Any, Callable
+from typing import TYPE_CHECKING, Any, Callable
 
-from nicegui import ui
-import pandas as pd
+from nicegui import background_tasks, binding, ui
 
 from fairlabel.config import settings
-from fairlabel.data import clean_column_name, get_dataset, infer_column_types
+from fairlabel.formats import clean_column_name
+from fairlabel.log import logger
 from fairlabel.models import MODELS, ModelDefinition
+from fairlabel.profiling import profiled
+from fairlabel.web import lazy
 from fairlabel.web.client import Client
 
+if TYPE_CHECKING:
+    import pandas as pd
+
 
 class SetupWizard:
+    # Bindable state, bound elements are updated in place when these change
+    current_step = binding.BindableProperty()
+    selected_dataset_name = binding.BindableProperty()
+    selected_model_name = binding.BindableProperty()
+
     def __init__(self, on_complete: Callable):
         self.on_complete = on_complete
         self.client = Client.retrieve()
         
         # State
-        self.current_step = 1
+        self.current_step: int = 1
         self.selected_dataset_name: str | None = None
         self.selected_model_name: str | None = None
         self.model_params: dict[str, Any] = {}
+        self.previews: dict[str, tuple["pd.DataFrame", int]] = {}
+        self.profiles: dict[str, dict] = {}
+        self.loading_previews: set[str] = set()
+        self.preview_errors: dict[str, str] = {}
         
         # UI Elements
         self.container = ui.column().classes("w-full h-full items-center justify-center p-8")
         self.render()
 
+    @profiled("wizard_render")
     def render(self):
+        """Builds the wizard once, afterwards only the affected sections are refreshed."""
         self.container.clear()
         with self.container:
             with ui.card().classes("w-full max-w-4xl p-6"):
-                # Stepper Header
-                with ui.row().classes("w-full justify-between mb-8"):
-                    self.render_step_header(1, "Select Dataset")
-                    ui.icon("arrow_forward").classes("text-gray-400 mt-2")
-                    self.render_step_header(2, "Select Model")
-                    ui.icon("arrow_forward").classes("text-gray-400 mt-2")
-                    self.render_step_header(3, "Configuration")
-
-                # Step Content
-                if self.current_step == 1:
+                self.render_stepper()
+
+                # Step Content: every step is built once and shown depending on the current step
+                with ui.column().classes("w-full").bind_visibility_from(self, "current_step", value=1):
                     self.render_dataset_step()
-                elif self.current_step == 2:
+                with ui.column().classes("w-full").bind_visibility_from(self, "current_step", value=2):
                     self.render_model_step()
-                elif self.current_step == 3:
+                with ui.column().classes("w-full").bind_visibility_from(self, "current_step", value=3):
                     self.render_config_step()
 
+    @ui.refreshable_method
+    def render_stepper(self):
+        with ui.row().classes("w-full justify-between mb-8"):
+            self.render_step_header(1, "Select Dataset")
+            ui.icon("arrow_forward").classes("text-gray-400 mt-2")
+            self.render_step_header(2, "Select Model")
+            ui.icon("arrow_forward").classes("text-gray-400 mt-2")
+            self.render_step_header(3, "Configuration")
+
     def render_step_header(self, step: int, title: str):
         color = "primary" if step <= self.current_step else "gray-300"
         weight = "bold" if step == self.current_step else "normal"
@@ -71,10 +90,7 @@ class SetupWizard:
             
             # Preview
             with ui.column().classes("w-2/3"):
-                if self.selected_dataset_name:
-                    self.render_dataset_preview()
-                else:
-                    ui.label("Select a dataset to view preview").classes("text-gray-500 italic")
+                self.render_dataset_preview()
 
         with ui.row().classes("w-full justify-end mt-8"):
             ui.button("Next", on_click=lambda: self.set_step(2)).props("color=primary").bind_enabled_from(
@@ -83,18 +99,64 @@ class SetupWizard:
 
     def on_dataset_select(self, e):
         self.selected_dataset_name = e.value
-        self.render()
+        self.render_dataset_preview.refresh()
 
+    @ui.refreshable_method
+    @profiled("wizard_render_dataset_preview", lambda self: {"dataset": self.selected_dataset_name})
     def render_dataset_preview(self):
-        df = get_dataset(self.selected_dataset_name)
-        preview_df = df.head(5)
-        
-        ui.label(f"Preview: {self.selected_dataset_name}").classes("text-lg font-semibold mb-2")
-        ui.label(f"{len(df)} rows, {len(df.columns)} columns").classes("text-sm text-gray-600 mb-4")
-        
-        cols = [{"name": col, "label": clean_column_name(col), "field": col} for col in preview_df.columns]
+        dataset_name = self.selected_dataset_name
+        if not dataset_name:
+            ui.label("Select a dataset to view preview").classes("text-gray-500 italic")
+            return
+
+        ui.label(f"Preview: {dataset_name}").classes("text-lg font-semibold mb-2")
+        if dataset_name in self.preview_errors:
+            ui.label(f"Preview failed: {self.preview_errors[dataset_name]}").classes("text-sm text-negative")
+            ui.button("Retry", on_click=lambda: self.retry_preview(dataset_name)).props("outline")
+            return
+        if dataset_name not in self.previews:
+            with ui.row().classes("items-center gap-2"):
+                ui.spinner()
+                ui.label("Loading preview...").classes("text-sm text-gray-600")
+            if dataset_name not in self.loading_previews:
+                self.loading_previews.add(dataset_name)
+                background_tasks.create(self.load_dataset_preview(dataset_name))
+            return
+
+        preview_df, n_rows = self.previews[dataset_name]
+        ui.label(f"{n_rows} rows, {len(preview_df.columns)} columns").classes("text-sm text-gray-600 mb-4")
+
+        # Column types are added once the dataset profile is available
+        columns = self.profiles.get(dataset_name, {}).get("columns", {})
+        labels = {col: clean_column_name(col) for col in preview_df.columns}
+        labels.update({col: f"{labels[col]} ({info['type']})" for col, info in columns.items() if col in labels})
+        cols = [{"name": col, "label": labels[col], "field": col} for col in preview_df.columns]
         ui.table(columns=cols, rows=preview_df.to_dict("records")).classes("w-full h-64")
 
+    async def load_dataset_preview(self, dataset_name: str):
+        """
+        Reads the preview off the event loop and shows it if the dataset is still selected.
+        Afterwards the dataset profile is loaded (or computed once), which the sidebar renders from.
+        """
+        try:
+            self.previews[dataset_name] = await lazy.io_bound("fairlabel.data:get_dataset_preview", dataset_name)
+            if self.selected_dataset_name == dataset_name:
+                self.render_dataset_preview.refresh()
+            profile = await lazy.io_bound("fairlabel.dataset_profile:get_dataset_profile", dataset_name)
+            self.profiles[dataset_name] = profile
+        except Exception as err:
+            logger.exception(f"Loading the preview of {dataset_name} failed")
+            if dataset_name not in self.previews:
+                self.preview_errors[dataset_name] = str(err) or type(err).__name__
+        finally:
+            self.loading_previews.discard(dataset_name)
+        if self.selected_dataset_name == dataset_name:
+            self.render_dataset_preview.refresh()
+
+    def retry_preview(self, dataset_name: str):
+        self.preview_errors.pop(dataset_name, None)
+        self.render_dataset_preview.refresh()
+
     # --- Step 2: Model Selection ---
     def render_model_step(self):
         ui.label("Choose a Model").classes("text-2xl font-bold mb-4")
@@ -104,11 +166,11 @@ class SetupWizard:
             "inline"
         ).classes("mb-4")
 
-        if self.selected_model_name:
-             ui.markdown(
-                f"**{self.selected_model_name}** selected. "
-                "Continue to configure hyperparameters."
-            ).classes("text-gray-600")
+        ui.markdown().classes("text-gray-600").bind_content_from(
+            self,
+            "selected_model_name",
+            backward=lambda name: f"**{name}** selected. Continue to configure hyperparameters." if name else "",
+        )
 
         with ui.row().classes("w-full justify-between mt-8"):
             ui.button("Back", on_click=lambda: self.set_step(1)).props("outline")
@@ -121,10 +183,15 @@ class SetupWizard:
         # Reset params on model change
         model_def = MODELS[self.selected_model_name]
         self.model_params = {p.name: p.default for p in model_def.hyperparameters}
-        self.render()
+        self.render_config_step.refresh()
 
     # --- Step 3: Configuration ---
+    @ui.refreshable_method
+    @profiled("wizard_render_config_step", lambda self: {"model": self.selected_model_name})
     def render_config_step(self):
+        if not self.selected_model_name:
+            return  # built once a model is selected
+
         ui.label("Configure Hyperparameters").classes("text-2xl font-bold mb-4")
         
         model_def = MODELS[self.selected_model_name]
@@ -168,7 +235,7 @@ class SetupWizard:
 
     def set_step(self, step):
         self.current_step = step
-        self.render()
+        self.render_stepper.refresh()
 
     def finish_setup(self):
         # Save configuration to client state
@@ -0,0 +1,47 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fairlabel.config import settings
+
+pytest_plugins = ["nicegui.testing.user_plugin"]
+
+
+@pytest.fixture
+def loan_dataset(tmp_path) -> str:
+    """A synthetic `loan_prediction` csv of 600 rows in a temporary data directory, returns the dataset short name."""
+    rng = np.random.default_rng(0)
+    n_rows = 600
+    self_employed = rng.choice([" Yes", " No"], n_rows)
+    score = rng.integers(300, 900, n_rows)
+    income = rng.lognormal(1.5, 0.4, n_rows)
+    approved = score / 600 + 0.2 * (self_employed == " No") + rng.normal(scale=0.3, size=n_rows) > 1.1
+    df = pd.DataFrame(
+        {
+            "loan_id": np.arange(n_rows),
+            " income_annum": income,
+            " self_employed": self_employed,
+            " education": rng.choice([" Graduate", " Not Graduate"], n_rows),
+            " cibil_score": score,
+            " loan_status": np.where(approved, " Approved", " Rejected"),
+        }
+    )
+    folder = tmp_path / "datasets" / settings.dataset.loan_prediction.name / "versions" / "1"
+    folder.mkdir(parents=True)
+    df.to_csv(folder / "loan.csv", index=False)
+
+    data_dir = settings.data.dir
+    settings.set("data.dir", tmp_path)
+    clear_caches()
+    yield "loan_prediction"
+    settings.set("data.dir", data_dir)
+    clear_caches()
+
+
+def clear_caches():
+    """Drop what fairlabel keeps in memory per dataset short name."""
+    from fairlabel import dataset_profile, labeling
+
+    labeling.load_features.cache_clear()
+    labeling.load_index.cache_clear()
+    dataset_profile._profiles.clear()
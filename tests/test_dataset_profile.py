@@ -0,0 +1,52 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from fairlabel import dataset_profile
+from fairlabel.dataset_profile import HISTOGRAM_BINS, compute_profile, get_dataset_profile, profile_file
+
+
+def test_compute_profile_over_chunks(tmp_path):
+    file = tmp_path / "data.csv"
+    df = pd.DataFrame(
+        {
+            "Income": [float(i) for i in range(1, 31)],
+            "Gender": ["Male", "Female", "Male"] * 10,
+        }
+    )
+    df["Income"] = df["Income"].astype(object)
+    df.loc[3, "Income"] = None
+    df.loc[25, "Income"] = "unknown"  # a stray token in a later chunk
+    df.loc[7, "Gender"] = None
+    df.to_csv(file, index=False)
+
+    profile = compute_profile(file, chunk_rows=10)
+
+    assert profile["rows"] == 30
+    income, gender = profile["columns"]["Income"], profile["columns"]["Gender"]
+    assert (income["type"], income["nulls"], income["min"], income["max"]) == ("numerical", 1, 1.0, 30.0)
+    assert len(income["histogram"]["counts"]) == HISTOGRAM_BINS
+    assert sum(income["histogram"]["counts"]) == 28  # the null and the stray token are skipped
+    assert (gender["nulls"], gender["unique"], gender["top"]) == (1, 2, {"Male": 20, "Female": 9})
+
+
+def test_concurrent_first_calls_compute_the_profile_once(loan_dataset: str, monkeypatch: pytest.MonkeyPatch):
+    calls = []
+
+    def slow_compute(file):
+        calls.append(threading.current_thread().name)
+        time.sleep(0.1)
+        return compute(file)
+
+    compute = dataset_profile.compute_profile
+    monkeypatch.setattr(dataset_profile, "compute_profile", slow_compute)
+    with ThreadPoolExecutor(4) as executor:
+        profiles = list(executor.map(lambda _: get_dataset_profile(loan_dataset), range(4)))
+
+    path = profile_file(loan_dataset)
+    assert len(calls) == 1
+    assert all(profile is profiles[0] for profile in profiles) and profiles[0]["rows"] == 600
+    assert [file.name for file in path.parent.iterdir()] == [path.name]  # no temporary file left
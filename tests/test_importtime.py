@@ -0,0 +1,14 @@
+from fairlabel.importtime import BUDGET_S, MODULE, measure
+
+
+def test_server_import_stays_within_budget():
+    seconds, _, loaded = min((measure() for _ in range(3)), key=lambda run: run[0])
+    assert not loaded, f"heavy modules imported eagerly: {sorted(loaded)}"
+    assert seconds <= BUDGET_S, f"cold import of {MODULE} took {seconds:.2f}s"
+
+
+def test_event_loop_helpers_stay_light():
+    # Imported by the web modules on the event loop, a heavy import here would block it while `preload` runs
+    for module in ("fairlabel.formats", "fairlabel.web.lazy"):
+        _, _, loaded = measure(module)
+        assert not loaded, f"{module} imports {sorted(loaded)}"
@@ -0,0 +1,98 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+from sklearn.ensemble import HistGradientBoostingClassifier
+
+from fairlabel import labeling
+from fairlabel.labeling import LogitCalibration, calibrate_proxy, parse_labels, train_model, validate_labels
+
+LABELS = pd.DataFrame({"row_id": [3, 1, 2], "label": ["Approved", "0", "1"]})
+
+
+def arrow_bytes(df: pd.DataFrame, stream: bool) -> bytes:
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    sink = io.BytesIO()
+    writer = pa.ipc.new_stream(sink, table.schema) if stream else pa.ipc.new_file(sink, table.schema)
+    with writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+@pytest.mark.parametrize(
+    "data, fmt",
+    [
+        (LABELS.to_csv(index=False).encode(), "csv"),
+        (LABELS.to_json(orient="records", lines=True).encode(), "jsonl"),
+        (arrow_bytes(LABELS, stream=False), "arrow"),
+        (arrow_bytes(LABELS, stream=True), "arrow"),
+    ],
+)
+def test_parse_labels(data: bytes, fmt: str):
+    df = parse_labels(data, fmt)
+    assert df["row_id"].tolist() == [3, 1, 2]
+    assert df["label"].astype(str).tolist() == ["Approved", "0", "1"]
+
+
+def test_parse_labels_rejects_unknown_formats_and_missing_columns():
+    with pytest.raises(ValueError, match="Unsupported label format"):
+        parse_labels(b"", "xml")
+    with pytest.raises(ValueError, match="missing the column"):
+        parse_labels(b"row_id,status\n1,1\n", "csv")
+
+
+def test_validate_labels_accepts_mixed_spellings(loan_dataset: str):
+    df = pd.DataFrame({"row_id": [0, 1, 2, 3, 4], "label": ["Approved", "1", " rejected", "0", "APPROVED "]})
+    assert validate_labels(df, loan_dataset) == {0: 1, 1: 1, 2: 0, 3: 0, 4: 1}
+
+
+@pytest.mark.parametrize(
+    "row_ids, labels, error",
+    [
+        (["a", 1.5, 2], ["1", "0", "1"], "2 row ids are not integers"),
+        ([-1, 600, 599], ["1", "0", "1"], "2 row ids are outside of 0..599"),
+        ([1, 2, 1], ["1", "0", "0"], "1 row ids are labeled more than once, e.g. 1"),
+        ([1, 2, 3], ["1", "maybe", "0"], "1 labels are not one of"),
+    ],
+)
+def test_validate_labels_rejects_the_whole_batch(loan_dataset: str, row_ids: list, labels: list, error: str):
+    with pytest.raises(ValueError, match=error):
+        validate_labels(pd.DataFrame({"row_id": row_ids, "label": labels}), loan_dataset)
+
+
+def test_logit_calibration_recovers_a_logit_linear_map():
+    proba = np.linspace(0.01, 0.99, 50)
+    target = 1 / (1 + np.exp(-(2.0 * LogitCalibration.logit(proba) - 0.5)))
+    calibration = LogitCalibration.fit(proba, target)
+
+    assert calibration.slope == pytest.approx(2.0) and calibration.intercept == pytest.approx(-0.5)
+    np.testing.assert_allclose(calibration.predict(proba), target, rtol=1e-6)
+    assert np.all(np.diff(calibration.predict(proba)) > 0), "the map keeps the ranking"
+
+
+def test_calibrate_proxy_reports_the_ranking_agreement(loan_dataset: str):
+    labels = {row: row % 2 for row in range(0, 600, 3)}
+    labels = dict(zip(labels, labeling.load_features(loan_dataset)[1][list(labels)].tolist()))
+    proxy = labeling.PROXY_MODELS["linear"]()
+    proxy = train_model(loan_dataset, proxy, labels)
+
+    _, same = calibrate_proxy(loan_dataset, proxy, proxy, labels, sample_size=300)
+    assert same["spearman"] == pytest.approx(1.0) and same["top_k_overlap"] == 1.0
+    assert same["n_labeled"] == len(labels)
+
+    heavy = train_model(loan_dataset, HistGradientBoostingClassifier(max_iter=20), labels)
+    calibration, other = calibrate_proxy(loan_dataset, proxy, heavy, labels, sample_size=300)
+    assert -1 <= other["spearman"] < 1 and 0 <= other["top_k_overlap"] <= 1
+    assert isinstance(calibration, LogitCalibration)
+
+
+def test_train_model_does_not_score_the_pool(loan_dataset: str, monkeypatch: pytest.MonkeyPatch):
+    def rank_pool(*args, **kwargs):
+        raise AssertionError("the pool was scored")
+
+    monkeypatch.setattr(labeling, "rank_pool", rank_pool)
+    proxy = labeling.PROXY_MODELS["linear"]()
+    assert train_model(loan_dataset, proxy, {1: 0, 2: 0}) is None  # a single class
+    assert train_model(loan_dataset, proxy, {1: 0, 2: 1, 3: 0, 4: 1}).classes_.tolist() == [0, 1]
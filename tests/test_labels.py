@@ -0,0 +1,72 @@
+from dataclasses import replace
+
+import pytest
+from nicegui import app
+from nicegui.testing import User
+
+from fairlabel import labeling
+from fairlabel.config import settings
+from fairlabel.web import labels
+from fairlabel.web.client import Client, ProxyState
+
+
+@pytest.fixture(autouse=True)
+def label_api(user: User):
+    # the simulation resets the app routes, register the API again
+    app.post("/api/clients/{client_id}/labels")(labels.post_labels)
+
+
+@pytest.fixture
+def api_token():
+    settings.set("api.token", "secret")
+    yield "secret"
+    settings.set("api.token", "")
+
+
+async def test_label_import_is_disabled_without_a_token(user: User):
+    response = await user.http_client.post("/api/clients/some-tab/labels", content=b"row_id,label\n1,1\n")
+    assert response.status_code == 403
+
+
+async def test_label_import_requires_the_token(user: User, api_token: str):
+    url = "/api/clients/some-tab/labels"
+    headers = {"Content-Type": "text/csv"}
+    response = await user.http_client.post(url, content=b"row_id,label\n1,1\n", headers=headers)
+    assert response.status_code == 403
+    response = await user.http_client.post(url, content=b"", headers={**headers, "X-Api-Token": "wrong"})
+    assert response.status_code == 403
+    response = await user.http_client.post(url, content=b"", headers={**headers, "X-Api-Token": api_token})
+    assert response.status_code == 404  # authorized, but no such client
+
+
+async def test_full_retrain_keeps_a_surrogate_refit_meanwhile(monkeypatch: pytest.MonkeyPatch):
+    client = Client(id="tab-1234")
+    client.reset()
+    client.labels = {1: 1, 2: 0}
+    client.proxy = ProxyState(model="surrogate-1")
+
+    def calibrate(dataset, surrogate, model, labels, sample):
+        client.proxy = replace(client.proxy, model="surrogate-2")  # retrain_proxy finishing during the await
+        return "calibration", {"overlap": 1.0}
+
+    monkeypatch.setattr(labeling, "train_model", lambda dataset, model, labels: "model")
+    monkeypatch.setattr(labeling, "calibrate_proxy", calibrate)
+    await labels.retrain_full(client)
+
+    assert client.proxy == ProxyState(
+        model="surrogate-2", calibration="calibration", full_retrain_labels=2, agreement={"overlap": 1.0}
+    )
+
+
+async def test_an_invalid_batch_applies_no_label(loan_dataset: str):
+    client = Client(id="tab-1234")
+    client.reset()
+    client.dataset = loan_dataset
+    client.labels = {1: 1}
+
+    with pytest.raises(ValueError, match="outside of 0..599"):
+        await labels.import_labels(client, b"row_id,label\n2,Approved\n700,Rejected\n", "csv")
+    assert client.labels == {1: 1}
+
+    assert await labels.import_labels(client, b"row_id,label\n2,Approved\n3, rejected\n", "csv") == 2
+    assert client.labels == {1: 1, 2: 1, 3: 0}
@@ -0,0 +1,64 @@
+import logging
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fairlabel import log
+from fairlabel.log import DeferredQueueHandler, SamplingFilter
+
+
+def record(msg: str = "retrained", lineno: int = 1, **extra) -> logging.LogRecord:
+    rec = logging.LogRecord("fairlabel.log", logging.INFO, "labels.py", lineno, msg, None, None)
+    rec.__dict__.update(extra)
+    return rec
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> list[float]:
+    now = [100.0]
+    monkeypatch.setattr(log.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_every_logs_once_per_interval_and_reports_the_suppressed_calls(clock: list[float]):
+    sampling = SamplingFilter()
+    assert sampling.filter(record(every=5.0))
+    assert not sampling.filter(record(every=5.0))
+    assert not sampling.filter(record(every=5.0))
+    assert sampling.filter(record(lineno=2, every=5.0))  # another call site has its own interval
+
+    clock[0] += 5.0
+    passed = record(every=5.0)
+    assert sampling.filter(passed)
+    assert passed.getMessage() == "retrained [2 similar suppressed]"
+
+
+def test_sample_keeps_the_given_share(monkeypatch: pytest.MonkeyPatch):
+    draws = iter([0.5, 0.005, 0.9])
+    monkeypatch.setattr(log.random, "random", lambda: next(draws))
+    sampling = SamplingFilter()
+    assert [sampling.filter(record(sample=0.01)) for _ in range(3)] == [False, True, False]
+    assert sampling.filter(record()), "calls without `every` or `sample` always pass"
+
+
+def test_concurrent_calls_are_counted_exactly(clock: list[float]):
+    sampling = SamplingFilter()
+    with ThreadPoolExecutor(8) as executor:
+        passed = sum(executor.map(lambda _: sampling.filter(record(every=5.0)), range(4000)))
+    clock[0] += 5.0
+    last = record(every=5.0)
+    assert passed == 1 and sampling.filter(last)
+    assert last.getMessage() == "retrained [3999 similar suppressed]"
+
+
+def test_queue_handler_merges_the_arguments_before_enqueueing():
+    records: queue.SimpleQueue = queue.SimpleQueue()
+    labels = {1: 0}
+    rec = logging.LogRecord("fairlabel.log", logging.INFO, "labels.py", 1, "labels: %s", (labels,), None)
+    DeferredQueueHandler(records).emit(rec)
+    labels[2] = 1  # changed while the record waits for the listener thread
+
+    queued = records.get_nowait()
+    assert queued.getMessage() == "labels: {1: 0}"
+    assert queued.args is None
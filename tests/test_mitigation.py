@@ -0,0 +1,54 @@
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from fairlabel.mitigation import WarmFairnessMitigator, demographic_parity_difference
+
+EPS = 0.05
+
+
+def biased_data(n_rows: int, seed: int = 0) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Group 1 is approved far more often, and the group is visible in the features."""
+    rng = np.random.default_rng(seed)
+    A = rng.integers(0, 2, n_rows)
+    X = np.column_stack([rng.normal(size=n_rows), A + rng.normal(scale=0.3, size=n_rows)])
+    y = (X[:, 0] + 1.5 * A + rng.normal(scale=0.5, size=n_rows) > 0.75).astype(int)
+    return X, y, A
+
+
+@pytest.fixture
+def data():
+    return biased_data(1000)
+
+
+def test_update_satisfies_the_constraint(data):
+    X, y, A = data
+    unmitigated = LogisticRegression().fit(X, y).predict(X)
+    mitigator = WarmFairnessMitigator(LogisticRegression(), eps=EPS).update(X, y, A)
+
+    assert demographic_parity_difference(unmitigated, A) > 0.3
+    assert mitigator.violations(mitigator.predict_proba(X)[:, 1], np.unique(A, return_inverse=True)[1]).max() <= EPS
+    assert demographic_parity_difference(mitigator.predict(X), A) < demographic_parity_difference(unmitigated, A)
+
+
+def test_warm_update_needs_fewer_fits_than_cold(data):
+    X, y, A = data
+    warm = WarmFairnessMitigator(LogisticRegression(), eps=EPS).update(X[:950], y[:950], A[:950])
+    warm.update(X, y, A)
+    cold = WarmFairnessMitigator(LogisticRegression(), eps=EPS).update(X, y, A)
+
+    assert 1 <= warm.n_fits < cold.n_fits
+    assert len(warm.predictors) <= warm.max_predictors
+
+
+def test_new_groups_start_cold(data):
+    X, y, A = data
+    mitigator = WarmFairnessMitigator(LogisticRegression(), eps=EPS).update(X[:950], y[:950], A[:950])
+    assert mitigator.theta.any()
+
+    A_three = np.where(np.arange(len(A)) % 10 == 0, 2, A)  # a third group appears
+    mitigator.update(X, y, A_three)
+    cold = WarmFairnessMitigator(LogisticRegression(), eps=EPS).update(X, y, A_three)
+    assert mitigator.groups.tolist() == [0, 1, 2]
+    assert mitigator.n_fits == cold.n_fits
+    np.testing.assert_allclose(mitigator.theta, cold.theta)
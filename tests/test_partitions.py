@@ -0,0 +1,66 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from sklearn.linear_model import LogisticRegression
+
+from fairlabel import labeling
+from fairlabel.config import settings
+from fairlabel.data import MANIFEST, partitions_dir
+from fairlabel.partitions import PartitionedDataset
+from fairlabel.strategies import positive_proba
+
+
+@pytest.fixture
+def partitions(loan_dataset: str):
+    settings.set("partitions.enabled", True)
+    settings.set("partitions.chunk_rows", 100)  # 6 partitions
+    yield
+    settings.set("partitions.enabled", False)
+    settings.set("partitions.chunk_rows", 500_000)
+
+
+def test_concurrent_ingestion_writes_the_partitions_once(loan_dataset: str):
+    with ThreadPoolExecutor(4) as executor:
+        datasets = list(executor.map(lambda _: PartitionedDataset.ingest(loan_dataset, chunk_rows=100), range(4)))
+
+    path = partitions_dir(loan_dataset)
+    assert all(dataset.path == path and len(dataset) == 600 for dataset in datasets)
+    assert (path / MANIFEST).exists()
+    assert [entry.name for entry in path.parent.iterdir()] == [path.name]  # no temporary directories left
+
+
+@pytest.mark.parametrize("strategy", ["uncertainty", "fair_hybrid"])
+def test_partitioned_ranking_matches_in_memory(loan_dataset: str, partitions, strategy: str):
+    labels = {row: row % 2 for row in range(0, 600, 7)}
+    X, y, A = labeling.labeled_features(loan_dataset, labels)
+    model = LogisticRegression().fit(X, y)
+
+    def rank():
+        return labeling.rank_pool(loan_dataset, labels, A, lambda X_pool: positive_proba(model, X_pool), 10, strategy)
+
+    on_disk = rank()
+    settings.set("partitions.enabled", False)
+    X_memory, _, A_memory = labeling.labeled_features(loan_dataset, labels)
+    in_memory = rank()
+
+    np.testing.assert_allclose(X, X_memory, atol=1e-5)
+    np.testing.assert_array_equal(A, A_memory)
+    assert on_disk == in_memory
+
+
+@pytest.mark.parametrize("strategy", ["density", "cluster_diverse", "core_set"])
+def test_neighborhood_strategies_rank_the_in_memory_pool(loan_dataset: str, strategy: str):
+    labels = {row: row % 2 for row in range(0, 600, 7)}
+    X, y, A = labeling.labeled_features(loan_dataset, labels)
+    model = LogisticRegression().fit(X, y)
+
+    candidates = labeling.rank_pool(loan_dataset, labels, A, lambda X_pool: positive_proba(model, X_pool), 10, strategy)
+    assert len(set(candidates)) == 10 and not set(candidates) & set(labels)
+
+    settings.set("partitions.enabled", True)
+    try:
+        with pytest.raises(ValueError, match="not available with partitions"):
+            labeling.rank_pool(loan_dataset, labels, A, lambda X_pool: positive_proba(model, X_pool), 10, strategy)
+    finally:
+        settings.set("partitions.enabled", False)
@@ -0,0 +1,25 @@
+import threading
+import time
+
+from fairlabel.profiling import Profiler
+
+
+def test_concurrent_captures_are_skipped(tmp_path):
+    profiler = Profiler(tmp_path, keep=10, enabled=True)
+    started = threading.Event()
+
+    def slow():
+        with profiler.capture("slow"):
+            started.set()
+            time.sleep(0.2)
+
+    thread = threading.Thread(target=slow)
+    thread.start()
+    started.wait()
+    with profiler.capture("concurrent"):  # would raise ValueError on Python 3.12+ without the process-wide lock
+        pass
+    thread.join()
+    with profiler.capture("after"):
+        pass
+
+    assert sorted(capture["operation"] for capture in profiler.captures()) == ["after", "slow"]
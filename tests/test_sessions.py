@@ -0,0 +1,78 @@
+import pickle
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+
+from fairlabel.web import client as client_module
+from fairlabel.web.client import Client
+from fairlabel.web.sessions import SessionManager, estimate_bytes
+
+
+@pytest.fixture
+def sessions(monkeypatch: pytest.MonkeyPatch, tmp_path) -> SessionManager:
+    """A session manager spilling every client on the next sweep."""
+    manager = SessionManager(spill_dir=tmp_path, ttl=-1, max_bytes=1 << 30)
+    monkeypatch.setattr(client_module, "sessions", manager)
+    return manager
+
+
+def labeled_client(sessions: SessionManager) -> Client:
+    client = Client(id="tab-1234")
+    client.reset()
+    client.labels = {1: 1, 2: 0}
+    sessions.touch(client)
+    return client
+
+
+def test_labels_written_while_spilled_are_kept(sessions: SessionManager):
+    client = labeled_client(sessions)
+    sessions.sweep()
+    assert client._labels is None  # spilled
+
+    client.update_labels({3: 1})
+    sessions.touch(client)
+    assert client.labels == {1: 1, 2: 0, 3: 1}
+
+
+def test_rehydrate_merges_into_newer_state(sessions: SessionManager):
+    client = labeled_client(sessions)
+    sessions.sweep()
+
+    client._labels = {2: 1, 3: 1}  # e.g. written by code holding the client across an await
+    sessions.ensure_resident(client)
+    assert client._labels == {1: 1, 2: 1, 3: 1}
+
+
+def test_clients_in_use_are_not_spilled(sessions: SessionManager):
+    client = labeled_client(sessions)
+    with sessions.in_use(client):
+        sessions.sweep()
+        assert client._labels == {1: 1, 2: 0}
+    sessions.sweep()
+    assert client._labels is None
+
+
+def test_size_estimate_follows_the_fitted_trees():
+    rng = np.random.default_rng(0)
+    X, y = rng.normal(size=(500, 4)), rng.integers(0, 2, 500)
+    forest = RandomForestClassifier(n_estimators=20, random_state=0).fit(X, y)
+
+    estimate = estimate_bytes({"_model_instance": forest, "_labels": {i: i % 2 for i in range(1000)}})
+    forest_bytes = sum(tree.tree_.__getstate__()["nodes"].nbytes for tree in forest.estimators_)
+    assert forest_bytes < estimate < 3 * forest_bytes + 100_000
+
+
+def test_least_recently_used_clients_are_spilled_above_the_ceiling(
+    sessions: SessionManager, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(pickle, "dumps", None)  # sizes are estimated, only spilling serializes
+    sessions.ttl = float("inf")
+    old, new = labeled_client(sessions), Client(id="tab-5678")
+    new.reset()
+    new.labels = {1: 1}
+    sessions.touch(new)
+    sessions.max_bytes = sessions.resident_bytes() - 1
+
+    sessions.sweep()
+    assert old._labels is None and new._labels == {1: 1}
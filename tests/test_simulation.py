@@ -0,0 +1,57 @@
+import numpy as np
+import pytest
+
+from fairlabel import simulation
+from fairlabel.index import FeatureIndex
+from fairlabel.simulation import SimulationRun, run_grid, simulate
+
+
+@pytest.fixture
+def array_dir(tmp_path):
+    """Feature arrays of a small synthetic dataset, laid out like `write_arrays` does."""
+    rng = np.random.default_rng(0)
+    A = rng.integers(0, 2, 400)
+    X = np.column_stack([rng.normal(size=400), rng.normal(size=400) + A]).astype(np.float32)
+    y = (X[:, 0] + 0.5 * A + rng.normal(scale=0.5, size=400) > 0.5).astype(np.int64)
+    directory = tmp_path / "version" / "arrays"
+    directory.mkdir(parents=True)
+    for name, array in (("y", y), ("A", A), ("X", X)):
+        np.save(directory / f"{name}.npy", array)
+    FeatureIndex.build(X).save(directory)
+    return directory
+
+
+@pytest.mark.parametrize("strategy", ["uncertainty", "density", "cluster_diverse", "core_set"])
+def test_simulate_labels_a_batch_per_round(array_dir, strategy: str):
+    run = SimulationRun(strategy=strategy, model="Logistic Regression", batch_size=5, seed=0, rounds=3)
+    curve = simulate(run, array_dir)
+
+    assert [record["round"] for record in curve] == [0, 1, 2, 3]
+    assert np.diff([record["n_labeled"] for record in curve]).tolist() == [5, 5, 5]
+    assert all(0 <= record["accuracy"] <= 1 for record in curve)
+
+
+def test_run_grid_resumes_finished_runs(array_dir, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(simulation, "write_arrays", lambda short_name, out_dir: array_dir)
+    runs = [SimulationRun("random", "Logistic Regression", batch_size=5, seed=seed, rounds=2) for seed in (0, 1)]
+    first = run_grid("synthetic", runs, array_dir.parent, workers=1)
+    assert sorted(file.stem for file in (array_dir.parent / "runs").glob("*.json")) == sorted(r.run_id for r in runs)
+
+    class NoExecutor:  # every run is already done, nothing may be simulated again
+        def __init__(self, max_workers=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, *args):
+            raise AssertionError("finished run simulated again")
+
+    monkeypatch.setattr(simulation, "ProcessPoolExecutor", NoExecutor)
+    assert run_grid("synthetic", runs, array_dir.parent).equals(first)
+
+    longer = SimulationRun("random", "Logistic Regression", batch_size=5, seed=0, rounds=3)
+    assert longer.run_id != runs[0].run_id  # a different number of rounds is a different run
@@ -0,0 +1,53 @@
+import numpy as np
+from sklearn.neighbors import NearestNeighbors
+
+from fairlabel.index import FeatureIndex
+from fairlabel.strategies import STRATEGIES, QueryContext
+
+
+def context(proba, index: FeatureIndex, labeled=()) -> QueryContext:
+    proba = np.asarray(proba, dtype=float)
+    return QueryContext(
+        proba=proba,
+        groups=np.zeros(len(proba), dtype=np.int32),
+        labeled_groups=np.zeros(len(labeled), dtype=np.int32),
+        rng=np.random.default_rng(0),
+        pool=np.arange(len(proba)),
+        labeled=np.asarray(labeled, dtype=np.int64),
+        index=index,
+    )
+
+
+def test_density_excludes_the_row_itself():
+    features = np.random.default_rng(0).normal(size=(300, 3))
+    index = FeatureIndex.build(features, n_neighbors=5, sample_size=100)
+
+    sample_rows = np.sort(np.random.default_rng(0).choice(300, size=100, replace=False))
+    dist, idx = NearestNeighbors(n_neighbors=6).fit(features[sample_rows]).kneighbors(features)
+    others = idx != np.searchsorted(sample_rows, np.arange(300))[:, None]
+    others[~np.isin(np.arange(300), sample_rows)] = True
+    expected = np.array([1 / (1 + d[keep][:5].mean()) for d, keep in zip(dist, others)])
+    np.testing.assert_allclose(index.density, expected, rtol=1e-5)
+    assert not np.isclose(index.density[sample_rows], 1.0).any()  # a self match would count a distance of 0
+
+
+def test_cluster_diverse_takes_turns_between_clusters():
+    proba = [0.5, 0.51, 0.52, 0.9, 0.53, 0.95]  # most uncertain first: 0, 1, 2, 4, 3, 5
+    index = FeatureIndex(
+        features=np.zeros((6, 1)),
+        clusters=np.array([0, 0, 0, 1, 1, 2]),
+        centroids=np.zeros((3, 1)),
+        density=np.ones(6),
+    )
+    picked = STRATEGIES["cluster_diverse"](context(proba, index), 4)
+    assert picked.tolist() == [0, 4, 5, 1]  # best of every cluster, then the second best of cluster 0
+
+
+def test_core_set_picks_the_candidates_farthest_from_the_labeled_rows():
+    features = np.array([[0.0], [0.1], [5.0], [5.1], [10.0], [0.2]])
+    index = FeatureIndex(features=features, clusters=np.zeros(6), centroids=np.zeros((1, 1)), density=np.ones(6))
+    ctx = context(np.full(5, 0.5), index, labeled=[5])
+    ctx.pool = np.arange(5)
+
+    picked = STRATEGIES["core_set"](ctx, 3)
+    assert picked.tolist() == [4, 3, 0]  # 10 is farthest from 0.2, then 5.1 from {0.2, 10}, then 0 from {0.2, 5.1, 10}
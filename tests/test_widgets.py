@@ -0,0 +1,34 @@
+import threading
+
+import pytest
+from nicegui import ui
+from nicegui.testing import User
+
+from fairlabel import dataset_profile
+from fairlabel.web.client import Client
+from fairlabel.web.widgets import Menu
+
+PROFILE = {"rows": 3, "columns": {"Gender": {"name": "Gender", "type": "categorical"}}}
+
+
+async def test_menu_profiles_the_dataset_off_the_event_loop(user: User, monkeypatch: pytest.MonkeyPatch):
+    profiled = threading.Event()
+
+    def get_dataset_profile(short_name):
+        profiled.wait(timeout=5)  # a profile that is still being computed
+        return PROFILE
+
+    monkeypatch.setattr(dataset_profile, "get_dataset_profile", get_dataset_profile)
+    client = Client(id="test-tab")
+    client.dataset = "loan_prediction"
+    monkeypatch.setattr(Client, "retrieve", staticmethod(lambda: client))
+
+    @ui.page("/")
+    def page():
+        Menu()
+
+    await user.open("/")
+    await user.should_see("Profiling dataset...")
+    profiled.set()
+    await user.should_see("Rows: 3")
+    await user.should_see("- Gender: categorical")
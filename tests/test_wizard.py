@@ -0,0 +1,92 @@
+import asyncio
+import json
+
+import pandas as pd
+import pytest
+from nicegui import core, ui
+from nicegui.testing import User
+
+from fairlabel import data, dataset_profile
+from fairlabel.web.client import Client
+from fairlabel.web.wizard import SetupWizard
+
+DATASET = "loan_prediction"
+PREVIEW = pd.DataFrame({"Gender": ["Male", "Female", "Male"], "Loan_Status": ["Y", "N", "Y"]})
+PROFILE = {"rows": 3, "columns": {"Gender": {"type": "categorical"}, "Loan_Status": {"type": "categorical"}}}
+
+
+@pytest.fixture
+def wizard_page(monkeypatch: pytest.MonkeyPatch) -> list[SetupWizard]:
+    """Serve the wizard on "/" without a dataset on disk, returns the created wizards."""
+    monkeypatch.setattr(data, "get_dataset_preview", lambda short_name: (PREVIEW, len(PREVIEW)))
+    monkeypatch.setattr(dataset_profile, "get_dataset_profile", lambda short_name: PROFILE)
+    client = Client(id="test-tab")
+    monkeypatch.setattr(Client, "retrieve", staticmethod(lambda: client))
+
+    wizards = []
+
+    @ui.page("/")
+    def page():
+        wizards.append(SetupWizard(on_complete=lambda: None))
+
+    return wizards
+
+
+def record_messages(user: User, monkeypatch: pytest.MonkeyPatch) -> list[tuple[str, int]]:
+    """
+    (message type, payload bytes) of everything the server sends to the user from now on,
+    recorded at the socket.io server every outgoing message passes (public python-socketio API).
+    """
+    messages = []
+    emit = core.sio.emit
+
+    async def recording_emit(event, data=None, *args, room=None, **kwargs):
+        if room == user.client.id:
+            messages.append((event, len(json.dumps(data, default=str))))
+        return await emit(event, data, *args, room=room, **kwargs)
+
+    monkeypatch.setattr(core.sio, "emit", recording_emit)
+    return messages
+
+
+async def test_failed_preview_can_be_retried(
+    user: User, wizard_page: list[SetupWizard], monkeypatch: pytest.MonkeyPatch, caplog: pytest.LogCaptureFixture
+):
+    def fail(short_name):
+        raise OSError("dataset file missing")
+
+    monkeypatch.setattr(data, "get_dataset_preview", fail)
+    await user.open("/")
+    wizard_page[0].selected_dataset_name = DATASET
+    wizard_page[0].render_dataset_preview.refresh()
+    await user.should_see("Preview failed: dataset file missing")
+    assert "Loading the preview of loan_prediction failed" in caplog.text
+    caplog.clear()  # the error is expected
+
+    monkeypatch.setattr(data, "get_dataset_preview", lambda short_name: (PREVIEW, len(PREVIEW)))
+    user.find("Retry").click()
+    await user.should_see("3 rows, 2 columns")
+    await user.should_not_see("Preview failed")
+
+
+async def test_step_change_only_sends_the_stepper(
+    user: User, wizard_page: list[SetupWizard], monkeypatch: pytest.MonkeyPatch
+):
+    await user.open("/")
+    wizard = wizard_page[0]
+    wizard.selected_dataset_name = DATASET
+    wizard.render_dataset_preview.refresh()
+    await user.should_see("3 rows, 2 columns")
+
+    messages = record_messages(user, monkeypatch)
+    user.find("Next").click()
+    await user.should_see("Choose a Model")
+    for _ in range(50):  # the outbox sends on its next iteration
+        if messages:
+            break
+        await asyncio.sleep(0.02)
+
+    # The step contents are built once and only toggled, a step change must not resend the preview table
+    assert wizard.current_step == 2
+    assert len(messages) == 1, messages  # one batched element update (~1.8 kB, mostly the refreshed stepper)
+    assert sum(size for _, size in messages) < 5_000, messages